@@ -0,0 +1,243 @@
+"""Headless stand-in for the parts of tkinter the app uses.
+
+Lets the app's screens and controller run without a display, for
+benchmarks that count widget calls (see widget_calls.py).
+Widgets only remember their options and geometry manager; nothing is laid
+out or drawn, so timings taken against it cover Python-side work only.
+
+The class layout mirrors tkinter's (Misc, Pack, Place, Grid, Widget, Tk)
+so the same method wrappers count calls on either.
+"""
+
+import itertools
+import sys
+from collections.abc import Callable
+from types import ModuleType
+
+BOTH, X, Y = "both", "x", "y"
+LEFT, RIGHT, TOP, BOTTOM = "left", "right", "top", "bottom"
+N, S, E, W, EW, NS = "n", "s", "e", "w", "ew", "ns"
+END, FLAT, NORMAL, DISABLED = "end", "flat", "normal", "disabled"
+
+
+class TclError(Exception):
+    """Raised where tkinter would raise TclError."""
+
+
+class Event:
+    """An event passed to bound callbacks."""
+
+    widget: "Misc | None" = None
+
+
+# Pending after/after_idle callbacks, run in order by run_pending
+_pending: list[tuple[str, Callable, tuple]] = []
+_ids = itertools.count()
+
+
+def run_pending():
+    """Run every pending after callback, including ones they schedule."""
+    while _pending:
+        _id, func, args = _pending.pop(0)
+        func(*args)
+
+
+class Misc:
+    """Option storage, bindings and scheduling shared by all widgets."""
+
+    def __init__(self, master: "Misc | None" = None, **options):
+        self.master = master
+        self.options = {"state": NORMAL, **options}
+        self.manager: str | None = None
+        self.manager_options: dict[str, object] = {}
+        self.bindings: dict[str, Callable] = {}
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    config = configure
+
+    def cget(self, key: str):
+        return self.options.get(key)
+
+    __getitem__ = cget
+
+    def bind(self, sequence: str, func: Callable, add: str | None = None):
+        self.bindings[sequence] = func
+
+    def after(self, _ms: int, func: Callable, *args) -> str:
+        after_id = f"after#{next(_ids)}"
+        _pending.append((after_id, func, args))
+        return after_id
+
+    def after_idle(self, func: Callable, *args) -> str:
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id: str):
+        _pending[:] = [item for item in _pending if item[0] != after_id]
+
+    def update_idletasks(self):
+        run_pending()
+
+    def update(self):
+        run_pending()
+
+    def focus_set(self):
+        pass
+
+    def winfo_ismapped(self) -> bool:
+        return self.manager is not None
+
+    def winfo_width(self) -> int:
+        return 500
+
+    def columnconfigure(self, _index: int, **_options):
+        pass
+
+    def pack_propagate(self, _flag: bool):
+        pass
+
+    def destroy(self):
+        pass
+
+    def _manage(self, manager: str, options: dict[str, object]):
+        if self.manager != manager:
+            self.manager_options = {}
+        self.manager = manager
+        self.manager_options.update(options)
+
+
+class Pack:
+    def pack_configure(self, **options):
+        self._manage("pack", options)
+
+    pack = pack_configure
+
+    def pack_forget(self):
+        self.manager = None
+
+
+class Place:
+    def place_configure(self, **options):
+        self._manage("place", options)
+
+    place = place_configure
+
+    def place_forget(self):
+        self.manager = None
+
+
+class Grid:
+    def grid_configure(self, **options):
+        self._manage("grid", options)
+
+    grid = grid_configure
+
+    def grid_remove(self):
+        # Keeps manager_options, like Tk
+        self.manager = None
+
+    def grid_forget(self):
+        self.manager = None
+        self.manager_options = {}
+
+
+class Widget(Misc, Pack, Place, Grid):
+    """Base of the stand-in widgets."""
+
+    def invoke(self):
+        return self.options["command"]()
+
+
+class Tk(Misc):
+    """The root window."""
+
+    def __init__(self):
+        super().__init__(None)
+
+    def title(self, _title: str):
+        pass
+
+    def geometry(self, _geometry: str):
+        pass
+
+    def mainloop(self):
+        run_pending()
+
+
+class Frame(Widget):
+    pass
+
+
+class Label(Widget):
+    pass
+
+
+class Button(Widget):
+    pass
+
+
+class Scrollbar(Widget):
+    def set(self, *_args):
+        pass
+
+
+class Listbox(Widget):
+    def __init__(self, master: Misc | None = None, **options):
+        super().__init__(master, **options)
+        self.items: list[str] = []
+        self.selection: tuple[int, ...] = ()
+
+    def insert(self, _index, item: str):
+        self.items.append(item)
+
+    def delete(self, _first, _last=None):
+        self.items = []
+
+    def selection_set(self, index: int):
+        self.selection = (index,)
+
+    def activate(self, _index: int):
+        pass
+
+    def curselection(self) -> tuple[int, ...]:
+        return self.selection
+
+    def get(self, index: int) -> str:
+        return self.items[index]
+
+    def yview(self, *_args):
+        pass
+
+
+class Canvas(Widget):
+    def __init__(self, master: Misc | None = None, **options):
+        super().__init__(master, **options)
+        self.items: dict[int, tuple] = {}
+
+    def create_line(self, *coords, **_options) -> int:
+        item = len(self.items) + 1
+        self.items[item] = coords
+        return item
+
+    def create_text(self, *coords, **_options) -> int:
+        return self.create_line(*coords)
+
+    def coords(self, item: int, *coords):
+        self.items[item] = coords
+
+    def delete(self, item):
+        self.items.pop(item, None)
+
+    def itemconfig(self, *_args, **_options):
+        pass
+
+
+def install() -> ModuleType:
+    """Make "import tkinter" return this module.
+
+    Must run before anything from protocols is imported.
+    """
+    module = sys.modules[__name__]
+    sys.modules["tkinter"] = module
+    return module
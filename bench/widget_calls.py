@@ -0,0 +1,98 @@
+"""Count the Tk widget calls each GameScreen step makes, without a display.
+
+Runs protocols.benchmark.bench_frames on the headless stand-in for tkinter
+and reports, per kind of step, how many configure and geometry manager
+calls the app made. This shows rendering changes that reduce the work
+handed to Tk; it can't time that work, which only bench_frames on a real
+display does.
+
+Run from the repository root with python -m bench.widget_calls.
+"""
+
+import argparse
+import sys
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from types import ModuleType
+
+from . import headless_tk
+
+# Tk methods that change a widget's options or geometry, by tkinter class,
+# each with the aliases it is also reachable through
+WIDGET_CALLS = {
+    "Misc": {"configure": ("configure", "config")},
+    "Pack": {"pack": ("pack_configure", "pack"), "pack_forget": ("pack_forget",)},
+    "Place": {
+        "place": ("place_configure", "place"),
+        "place_forget": ("place_forget",),
+    },
+    "Grid": {
+        "grid": ("grid_configure", "grid"),
+        "grid_remove": ("grid_remove",),
+        "grid_forget": ("grid_forget",),
+    },
+}
+
+
+@contextmanager
+def count_widget_calls(tk: ModuleType) -> Iterator[Counter[str]]:
+    """Count widget configure and geometry manager calls while active.
+
+    Works on tkinter and on headless_tk alike.
+    """
+    calls: Counter[str] = Counter()
+    originals: list[tuple[type, str, Callable]] = []
+
+    def counting(name: str, method: Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return method(*args, **kwargs)
+
+        return wrapper
+
+    for class_name, methods in WIDGET_CALLS.items():
+        cls = getattr(tk, class_name)
+        for name, attributes in methods.items():
+            for attribute in attributes:
+                method = getattr(cls, attribute)
+                originals.append((cls, attribute, method))
+                setattr(cls, attribute, counting(name, method))
+    try:
+        yield calls
+    finally:
+        for cls, attribute, method in originals:
+            setattr(cls, attribute, method)
+
+
+def main():
+    """Report widget calls per step of headless gameplay."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if "protocols" in sys.modules:
+        parser.error("protocols was imported before tkinter could be replaced")
+    tk = headless_tk.install()
+    from protocols.benchmark import bench_frames
+
+    calls: dict[str, Counter[str]] = {}
+
+    @contextmanager
+    def counted(name: str) -> Iterator[None]:
+        with count_widget_calls(tk) as step_calls:
+            yield
+        calls.setdefault(name, Counter()).update(step_calls)
+
+    samples = bench_frames(args.steps, args.seed, around_step=counted)
+    for name, timings in samples.items():
+        per_step = ", ".join(
+            f"{call}={count / len(timings):.2f}"
+            for call, count in sorted(calls.get(name, Counter()).items())
+        )
+        print(f"{name:<16} n={len(timings):<6} {per_step or 'no calls'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""Benchmarks for the protocols application.
+
+Run with python -m protocols.benchmark <benchmark>.
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+
+from .gameplay import GameplayController, play_session
+from .models import Protocol, StateType
+from .parser import DEFAULT_DATA_DIR, load_protocols_from_directory
+from .shared import SharedLibrary
+from .synth import write_corpus
+
+
+def _summarize(name: str, samples_ns: list[int]) -> str:
+    """Format timing samples (in nanoseconds) as a one-line summary."""
+    if not samples_ns:
+        return f"{name:<24} no samples"
+    samples = sorted(samples_ns)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return (
+        f"{name:<24} n={len(samples):<7} "
+        f"mean={statistics.fmean(samples) / 1000:9.2f}us "
+        f"p50={samples[len(samples) // 2] / 1000:9.2f}us "
+        f"p99={p99 / 1000:9.2f}us"
+    )
+
+
+def _timed(func: Callable[[], object]) -> int:
+    """Run func once and return the elapsed time in nanoseconds."""
+    start = time.perf_counter_ns()
+    func()
+    return time.perf_counter_ns() - start
+
+
+def bench_load(data_dir: Path, iterations: int) -> list[int]:
+    """Time loading every protocol in a directory."""
+    return [
+        _timed(lambda: load_protocols_from_directory(data_dir))
+        for _ in range(iterations)
+    ]
+
+
+def bench_gameplay(
+    protocols: dict[str, Protocol], sessions: int
+) -> dict[str, list[int]]:
+    """Time the prefetch and Continue paths over random headless sessions.
+
+    Prefetching is timed on its own, as it runs while feedback is shown, and
+    Continue is timed afterwards so it only measures swapping in the
+    prepared state.
+    """
+    samples: dict[str, list[int]] = {"prefetch": [], "continue": []}
+    controller = GameplayController(protocols)
+
+    def advance():
+        samples["prefetch"].append(_timed(controller.prefetch_next_states))
+        samples["continue"].append(_timed(controller.advance_to_next_state))
+
+    names = list(protocols)
+    for _ in range(sessions):
+        play_session(
+            controller,
+            random.choice(names),
+            lambda prepared: random.choice(prepared.options),
+            advance=advance,
+        )
+
+    return samples
+
+
+def _private_memory_kib() -> int:
+    """Memory private to this process (Linux RssAnon), in KiB."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1])
+    return 0
+
+
+def _worker_memory(data_dir: Path, library_name: str | None, sessions: int) -> int:
+    """Load or attach to the library, play sessions, report private memory."""
+    if library_name is None:
+        protocols = load_protocols_from_directory(data_dir)
+        bench_gameplay(protocols, sessions)
+        return _private_memory_kib()
+
+    with SharedLibrary.attach(library_name) as library:
+        bench_gameplay(library, sessions)
+        return _private_memory_kib()
+
+
+def bench_workers(
+    data_dir: Path, worker_counts: list[int], sessions: int
+) -> list[dict[str, float]]:
+    """Compare per-worker private memory with private and shared libraries.
+
+    Returns:
+        One row per (mode, workers) point with the mean private memory of a
+        worker in MiB
+    """
+    rows = []
+    for shared in (False, True):
+        library = SharedLibrary.from_directory(data_dir) if shared else None
+        try:
+            for workers in worker_counts:
+                # Spawned so workers don't inherit this process's heap
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                ) as executor:
+                    futures = [
+                        executor.submit(
+                            _worker_memory,
+                            data_dir,
+                            library.name if library else None,
+                            sessions,
+                        )
+                        for _ in range(workers)
+                    ]
+                    kib = [future.result() for future in futures]
+                rows.append(
+                    {
+                        "mode": "shared" if shared else "private",
+                        "workers": workers,
+                        "worker_mib": statistics.fmean(kib) / 1024,
+                    }
+                )
+        finally:
+            if library is not None:
+                library.close()
+                library.unlink()
+    return rows
+
+
+def bench_scaling(
+    file_counts: list[int],
+    state_counts: list[int],
+    branching: int,
+    wrong_answers: int,
+    cross_links: int,
+) -> list[dict[str, float]]:
+    """Measure load time and memory over synthetic corpora of growing size.
+
+    Returns:
+        One row per (files, states) point with load time in seconds and
+        traced memory in MiB
+    """
+    rows = []
+    for files in file_counts:
+        for states in state_counts:
+            with tempfile.TemporaryDirectory() as tmp:
+                directory = Path(tmp)
+                write_corpus(
+                    directory,
+                    files=files,
+                    states=states,
+                    branching=branching,
+                    wrong_answers=wrong_answers,
+                    cross_links=cross_links,
+                    seed=0,
+                )
+                gc.collect()
+                start = time.perf_counter()
+                load_protocols_from_directory(directory)
+                load_seconds = time.perf_counter() - start
+
+                gc.collect()
+                tracemalloc.start()
+                protocols = load_protocols_from_directory(directory)
+                retained, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del protocols
+
+            rows.append(
+                {
+                    "files": files,
+                    "states": states,
+                    "load_s": load_seconds,
+                    "retained_mib": retained / 2**20,
+                    "peak_mib": peak / 2**20,
+                }
+            )
+    return rows
+
+
+def bench_startup(iterations: int) -> dict[str, list[int]]:
+    """Time app startup to the first interactive frame in fresh processes.
+
+    Reports both the time measured inside the app, from process start (on
+    Linux; from package import elsewhere) to the first paint of the
+    selection screen, and the wall time from spawning the process to its
+    exit, which also includes tearing the window down. Needs a display.
+    """
+    samples: dict[str, list[int]] = {"startup (in app)": [], "startup (wall)": []}
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        output = subprocess.run(
+            [sys.executable, "-m", "protocols", "--measure-startup"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        wall = time.perf_counter_ns() - start
+
+        for line in output.splitlines():
+            if line.startswith("startup_seconds="):
+                seconds = float(line.split("=", 1)[1])
+                samples["startup (in app)"].append(int(seconds * 1e9))
+        samples["startup (wall)"].append(wall)
+    return samples
+
+
+def bench_frames(
+    steps: int,
+    seed: int = 0,
+    around_step: Callable[[str], AbstractContextManager[object]] | None = None,
+) -> dict[str, list[int]]:
+    """Time each gameplay step of the real app through to the end of Tk's idle
+    work, which includes geometry management and redrawing.
+
+    Answers and Continue are driven through the widgets themselves. Needs a
+    display; run it on the target hardware to compare rendering changes.
+
+    Args:
+        steps: Number of Continue steps to time
+        seed: Seed for the protocols and answers chosen
+        around_step: Called with the kind of each step; the context manager
+            it returns is entered around the step (see bench/widget_calls.py)
+    """
+    # Imported here, so a stand-in tkinter can be installed before the
+    # screens load
+    import tkinter as tk
+
+    from .controller import App
+
+    root = tk.Tk()
+    app = App(root)
+    root.update()
+
+    rng = random.Random(seed)
+    names = list(app.protocols)
+    samples: dict[str, list[int]] = {"answer frame": [], "continue frame": []}
+
+    def step(name: str, widget: tk.Button):
+        with around_step(name) if around_step else nullcontext():
+            samples[name].append(
+                _timed(lambda: (widget.invoke(), root.update_idletasks()))
+            )
+
+    while len(samples["continue frame"]) < steps:
+        if app.screens.current != "game":
+            app.protocol_select.on_start(rng.choice(names))
+            root.update()
+        screen = app.game_screen
+        state = app.gameplay.current_state
+        if state is not None and state.state_type == StateType.QUESTION:
+            index = rng.randrange(len(screen.current_options))
+            step("answer frame", screen.answer_buttons[index])
+        step("continue frame", screen.continue_btn)
+        # Let pending events settle between steps
+        root.update()
+
+    root.destroy()
+    return samples
+
+
+def _int_list(value: str) -> list[int]:
+    """Parse a comma-separated list of integers."""
+    return [int(item) for item in value.split(",") if item]
+
+
+def main():
+    """Run the selected benchmarks and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "benchmark",
+        nargs="?",
+        choices=[
+            "load",
+            "gameplay",
+            "scaling",
+            "startup",
+            "frames",
+            "workers",
+            "all",
+        ],
+        default="all",
+    )
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--sessions", type=int, default=1000)
+
+    scaling = parser.add_argument_group("scaling (synthetic corpora)")
+    scaling.add_argument("--files", type=_int_list, default=[1, 10, 100, 1000])
+    scaling.add_argument("--states", type=_int_list, default=[50])
+    scaling.add_argument("--branching", type=int, default=2)
+    scaling.add_argument("--wrong-answers", type=int, default=15)
+    scaling.add_argument("--cross-links", type=int, default=1)
+    parser.add_argument(
+        "--workers",
+        type=_int_list,
+        default=[1, 2, 4, os.cpu_count() or 1],
+        help="worker counts for the workers benchmark",
+    )
+    args = parser.parse_args()
+
+    if args.benchmark in ("load", "all"):
+        print(_summarize("load", bench_load(args.data_dir, args.iterations)))
+
+    if args.benchmark in ("gameplay", "all"):
+        protocols = load_protocols_from_directory(args.data_dir)
+        for name, samples in bench_gameplay(protocols, args.sessions).items():
+            print(_summarize(name, samples))
+
+    # Not part of "all": spawns many processes
+    if args.benchmark == "workers":
+        print("mode,workers,worker_mib")
+        for row in bench_workers(args.data_dir, args.workers, args.sessions):
+            print(f"{row['mode']},{row['workers']},{row['worker_mib']:.2f}")
+
+    # Not part of "all": needs a display
+    if args.benchmark == "startup":
+        for name, samples in bench_startup(min(args.iterations, 20)).items():
+            print(_summarize(name, samples))
+
+    # Not part of "all": needs a display
+    if args.benchmark == "frames":
+        for name, samples in bench_frames(args.iterations).items():
+            print(_summarize(name, samples))
+
+    # Not part of "all": generating large corpora takes a while
+    if args.benchmark == "scaling":
+        print("files,states,load_s,retained_mib,peak_mib")
+        for row in bench_scaling(
+            args.files,
+            args.states,
+            args.branching,
+            args.wrong_answers,
+            args.cross_links,
+        ):
+            print(
+                f"{row['files']},{row['states']},{row['load_s']:.4f},"
+                f"{row['retained_mib']:.2f},{row['peak_mib']:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,107 +1,291 @@
 """Main application controller."""
 
+import logging
+import os
+import time
 import tkinter as tk
+from collections.abc import Callable
 from pathlib import Path
 
+from .base import BaseScreen
+from .events import FrameCoalescer, ScoreUpdated
 from .gameplay import GameplayController
-from .models import Protocol, State
-from .parser import load_protocols_from_directory
+from .history import ScoreHistory
+from .library import LibrarySnapshot, ProtocolLibrary
+from .models import Protocol, State, StateType
+from .parser import DEFAULT_DATA_DIR
+from .replay import SessionRecord
 from .screens import GameScreen, ProtocolSelectScreen, ResultsScreen
 
+logger = logging.getLogger(__name__)
+
+
+def _process_age() -> float | None:
+    """Seconds since this process started, or None where unknown.
+
+    Read from the process start time in /proc (clock tick resolution,
+    usually 10ms), so it includes interpreter startup. Only called when
+    startup is measured.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesized command name; starttime is field 22
+            fields = f.read().rsplit(")", 1)[1].split()
+        started_since_boot = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        age = time.clock_gettime(time.CLOCK_BOOTTIME) - started_since_boot
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+    return max(age, 0.0)
+
+
+class ScreenRegistry:
+    """Registry that builds screens on first use and shows one at a time."""
+
+    def __init__(self):
+        self._factories: dict[str, Callable[[], BaseScreen]] = {}
+        self._screens: dict[str, BaseScreen] = {}
+        self.current: str | None = None
+
+    def register(self, name: str, factory: Callable[[], BaseScreen]):
+        """Register how to build a screen; it is built on first use."""
+        self._factories[name] = factory
+
+    def is_created(self, name: str) -> bool:
+        """Whether a screen has been built yet."""
+        return name in self._screens
+
+    def get(self, name: str) -> BaseScreen:
+        """Get a screen, building it if needed."""
+        if name not in self._screens:
+            self._screens[name] = self._factories[name]()
+        return self._screens[name]
+
+    def show(self, name: str) -> BaseScreen:
+        """Hide the current screen and show the named one."""
+        if self.current is not None and self.current != name:
+            self._screens[self.current].hide()
+        screen = self.get(name)
+        screen.show()
+        self.current = name
+        return screen
+
 
 class App:
     """Main application managing screens and gameplay."""
 
-    def __init__(self, root: tk.Tk, data_dir: Path | None = None):
+    def __init__(
+        self,
+        root: tk.Tk,
+        data_dir: Path | None = None,
+        session_log: Path | None = None,
+        trainee: str = "trainee",
+        history_dir: Path | None = None,
+    ):
         """Initialize the application.
 
         Args:
             root: The tkinter root window
             data_dir: Directory containing protocol markdown files
+            session_log: JSON lines file that completed sessions are appended
+                to, for replay with python -m protocols.replay
+            trainee: Name the trainee's score history is kept under
+            history_dir: Directory score histories are stored in; kept in
+                memory only if None
         """
+        # Where process start time is unknown, startup is timed from here
+        self._created_at = time.perf_counter()
         self.root = root
+        self.session_log = session_log
+        self.trainee = trainee
+        self.history = ScoreHistory(history_dir)
+        # Read the trainee's history off the Tk thread, well before the first
+        # results screen needs it
+        self.history.preload(trainee)
         self.root.title("EMS Protocol Practice")
         self.root.geometry("700x600")
         self.root.configure(bg="#2c3e50")
 
         # Load protocols
-        if data_dir is None:
-            data_dir = Path(__file__).parent / "data"
-        self.protocols = load_protocols_from_directory(data_dir)
+        self.library = ProtocolLibrary(data_dir or DEFAULT_DATA_DIR)
         self.current_protocol_name: str | None = None
 
-        # Create gameplay controller
+        # Create gameplay controller; each game pins the library's snapshot
         self.gameplay = GameplayController(
-            protocols=self.protocols,
+            protocols=self.library,
             on_state_changed=self._on_state_changed,
             on_game_complete=self._on_game_complete,
-            on_score_updated=self._on_score_updated,
         )
-
-        # Create screens
-        self.protocol_select = ProtocolSelectScreen(
-            root=self.root,
-            protocol_names=list(self.protocols.keys()),
-            on_start=self._start_game,
+        # Answers can come faster than frames; redraw the score once per frame
+        self.gameplay.events.subscribe(
+            ScoreUpdated, FrameCoalescer(self.root, self._on_score_updated)
         )
 
-        self.game_screen = GameScreen(
-            root=self.root,
-            on_back=self._back_to_menu,
-            on_answer=self._on_answer,
-            on_continue=self._on_continue,
+        # Register screens; each is built the first time it is shown
+        self.screens = ScreenRegistry()
+        self.screens.register(
+            "select",
+            lambda: ProtocolSelectScreen(
+                root=self.root,
+                protocol_names=list(self.protocols.keys()),
+                on_start=self._start_game,
+            ),
         )
-
-        self.results_screen = ResultsScreen(
-            root=self.root,
-            on_play_again=self._play_again,
-            on_main_menu=self._back_to_menu,
+        self.screens.register(
+            "game",
+            lambda: GameScreen(
+                root=self.root,
+                on_back=self._back_to_menu,
+                on_answer=self._on_answer,
+                on_continue=self._on_continue,
+            ),
+        )
+        self.screens.register(
+            "results",
+            lambda: ResultsScreen(
+                root=self.root,
+                on_play_again=self._play_again,
+                on_main_menu=self._back_to_menu,
+            ),
         )
 
         # Show initial screen
-        self.protocol_select.show()
+        select = self.screens.show("select")
+        self.root.bind("<F5>", lambda e: self.reload_protocols())
+
+        # Seconds from process start to the first interactive frame
+        self.startup_seconds: float | None = None
+        self._first_expose_seen = False
+        select.frame.bind("<Expose>", self._on_first_expose, add="+")
+
+    @property
+    def protocols(self) -> LibrarySnapshot:
+        """The latest published protocols, by name."""
+        return self.library.current
+
+    @property
+    def protocol_select(self) -> ProtocolSelectScreen:
+        """The protocol selection screen, built on first access."""
+        return self.screens.get("select")
 
-    def _start_game(self, protocol_name: str):
+    @property
+    def game_screen(self) -> GameScreen:
+        """The game screen, built on first access."""
+        return self.screens.get("game")
+
+    @property
+    def results_screen(self) -> ResultsScreen:
+        """The results screen, built on first access."""
+        return self.screens.get("results")
+
+    def _on_first_expose(self, _event: tk.Event):
+        """Wait for the first paint of the selection screen once it is exposed.
+
+        Tk repaints exposed widgets in idle callbacks queued by the Expose
+        event, so an idle callback queued now runs after that paint.
+        """
+        if self._first_expose_seen:
+            return
+        self._first_expose_seen = True
+        self.root.after_idle(self._on_first_frame)
+
+    def _on_first_frame(self):
+        """Record the time to the first interactive frame."""
+        age = _process_age()
+        if age is None:
+            age = time.perf_counter() - self._created_at
+        self.startup_seconds = age
+        logger.info("First interactive frame after %.3fs", self.startup_seconds)
+
+    def reload_protocols(self):
+        """Reload the protocol files in the background.
+
+        Games in progress keep the version they started with; the new one is
+        used from the next game on.
+        """
+        future = self.library.reload_async()
+
+        def check():
+            if not future.done():
+                self.root.after(50, check)
+            elif future.exception() is not None:
+                logger.error("Reloading protocols failed: %s", future.exception())
+            else:
+                snapshot = future.result()
+                logger.info(
+                    "Loaded protocol library version %d (%d protocols)",
+                    snapshot.version,
+                    len(snapshot),
+                )
+                if self.screens.is_created("select"):
+                    self.protocol_select.update_protocols(list(snapshot))
+
+        self.root.after(50, check)
+
+    def _start_game(self, protocol_name: str | None):
         """Start a game with the selected protocol."""
+        if not self._check_protocol(protocol_name):
+            return
         self.current_protocol_name = protocol_name
-        self.protocol_select.hide()
-        self.game_screen.show()
+        self.screens.show("game")
         self.gameplay.start_game(protocol_name)
 
+    def _check_protocol(self, protocol_name: str | None) -> bool:
+        """Whether protocol_name is in the current library.
+
+        A reload can remove or rename a protocol after it was listed or
+        played. If it did, refresh the list and go back to the menu instead.
+        """
+        if protocol_name in self.protocols:
+            return True
+        logger.warning("Protocol %r is no longer in the library", protocol_name)
+        self.current_protocol_name = None
+        self.protocol_select.update_protocols(list(self.protocols))
+        self._back_to_menu()
+        return False
+
     def _back_to_menu(self):
         """Return to the protocol selection menu."""
-        self.game_screen.hide()
-        self.results_screen.hide()
-        self.protocol_select.show()
+        self.screens.show("select")
 
     def _on_state_changed(self, state: State):
         """Handle state change from gameplay controller."""
-        self.game_screen.display_state(state)
+        self.game_screen.display_state(state, self.gameplay.current_prepared)
+        if state.state_type == StateType.INTRO:
+            # Nothing to answer, prepare the next states while "Next" is shown
+            self.root.after_idle(self.gameplay.prefetch_next_states)
 
     def _on_answer(self, answer: str, _user_selected: bool):
         """Handle user answer."""
         is_correct = self.gameplay.handle_answer(answer)
         correct_answer = self.gameplay.get_current_correct_answer()
         self.game_screen.show_feedback(is_correct, correct_answer or "")
+        # Prepare the next states while the feedback is on screen
+        self.root.after_idle(self.gameplay.prefetch_next_states)
 
     def _on_continue(self):
         """Handle continue button press."""
         self.gameplay.advance_to_next_state()
 
-    def _on_score_updated(self, correct: int, total: int):
-        """Handle score update (could be used for live score display)."""
-        pass
+    def _on_score_updated(self, event: ScoreUpdated):
+        """Show the live score on the game screen."""
+        if self.screens.is_created("game"):
+            self.game_screen.display_score(event.correct, event.total)
 
     def _on_game_complete(self, final_state: State | None, correct: int, total: int):
         """Handle game completion."""
-        self.game_screen.hide()
+        if self.session_log is not None:
+            record = SessionRecord.from_controller(self.gameplay)
+            with self.session_log.open("a") as f:
+                f.write(record.to_json() + "\n")
+
         description = final_state.description if final_state else "Protocol complete!"
         self.results_screen.display_results(description, correct, total)
-        self.results_screen.show()
+        self.history.append_session(self.trainee, self.gameplay.answer_results)
+        self.results_screen.display_trend(
+            self.trainee, self.history.series(self.trainee)
+        )
+        self.screens.show("results")
 
     def _play_again(self):
         """Play the same protocol again."""
-        self.results_screen.hide()
-        self.game_screen.show()
-        if self.current_protocol_name:
-            self.gameplay.start_game(self.current_protocol_name)
+        self._start_game(self.current_protocol_name)
@@ -0,0 +1,301 @@
+"""Near-duplicate answer detection across a protocol library.
+
+Every wrong and correct answer is indexed with MinHash signatures over
+word shingles and bucketed with locality-sensitive hashing, so only
+answers that share a bucket are ever compared. This finds near-duplicate
+wrong answers ("Perform blind finger sweep." vs "Perform a blind finger
+sweep") and wrong answers that nearly match some state's correct answer,
+in near-linear time. Files can be re-indexed one at a time as they change.
+
+Run with python -m protocols.dedupe [DATA_DIR].
+"""
+
+import argparse
+import hashlib
+import re
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .parser import (
+    DEFAULT_DATA_DIR,
+    POOL_LIBRARY_SUFFIX,
+    PoolCache,
+    parse_protocol_file,
+)
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_STOPWORDS = frozenset(
+    "a an the and or to of with in on at for by from his her their is".split()
+)
+
+
+@dataclass(frozen=True)
+class AnswerRef:
+    """Where an answer appears in the library."""
+
+    path: Path
+    protocol_name: str
+    state_id: int
+    correct: bool
+    text: str
+
+
+@dataclass
+class DuplicateCluster:
+    """A group of answers that are near-duplicates of each other."""
+
+    refs: list[AnswerRef] = field(default_factory=list)
+
+    @property
+    def texts(self) -> list[str]:
+        """The distinct answer texts in the cluster."""
+        return list(dict.fromkeys(ref.text for ref in self.refs))
+
+    @property
+    def conflicts(self) -> list[tuple[AnswerRef, AnswerRef]]:
+        """Pairs of (wrong answer, correct answer) that nearly match."""
+        correct = [ref for ref in self.refs if ref.correct]
+        return [
+            (wrong, right)
+            for wrong in self.refs
+            if not wrong.correct
+            for right in correct
+        ]
+
+
+def normalize(text: str) -> str:
+    """Lowercase and reduce punctuation and whitespace to single spaces."""
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def shingles(text: str) -> set[str]:
+    """Words and word pairs of normalized text, ignoring stopwords."""
+    words = [word for word in normalize(text).split() if word not in _STOPWORDS]
+    if not words:
+        return {normalize(text)}
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+class DistractorIndex:
+    """MinHash + LSH index over the answers of a protocol library.
+
+    Answers are keyed by normalized text, so exact repeats (the common case)
+    are hashed once. Two answers become candidates when their signatures
+    agree on every row of at least one band; candidates are confirmed with
+    the exact Jaccard similarity of their shingles.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 64,
+        bands: int = 16,
+    ):
+        """Initialize the index.
+
+        Args:
+            threshold: Minimum shingle Jaccard similarity of near-duplicates
+            num_perm: Number of MinHash permutations
+            bands: Number of LSH bands; num_perm must be divisible by it.
+                More bands find less similar candidates.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._num_perm = num_perm
+        self._unpack = struct.Struct(f"<{num_perm}I").unpack
+
+        # Normalized text -> answers with that text
+        self._refs: dict[str, set[AnswerRef]] = {}
+        self._shingles: dict[str, set[str]] = {}
+        self._band_keys: dict[str, list[tuple[int, int]]] = {}
+        # (band, band hash) -> normalized texts in that bucket
+        self._buckets: dict[tuple[int, int], set[str]] = {}
+        # File -> (mtime, answers indexed from it)
+        self._files: dict[Path, tuple[float, list[AnswerRef]]] = {}
+
+    def _signature(self, items: set[str]) -> tuple[int, ...]:
+        """MinHash signature of a set of shingles.
+
+        One extendable-output hash per shingle supplies all num_perm hash
+        values at once, and the column minimums are taken in C.
+        """
+        size = 4 * self._num_perm
+        rows = [
+            self._unpack(hashlib.shake_128(item.encode()).digest(size))
+            for item in items
+        ]
+        return tuple(map(min, zip(*rows)))
+
+    def add(self, ref: AnswerRef):
+        """Index one answer."""
+        key = normalize(ref.text)
+        if key in self._refs:
+            self._refs[key].add(ref)
+            return
+
+        self._refs[key] = {ref}
+        items = shingles(ref.text)
+        signature = self._signature(items)
+        band_keys = [
+            (band, hash(signature[band * self.rows : (band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+        self._shingles[key] = items
+        self._band_keys[key] = band_keys
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def remove(self, ref: AnswerRef):
+        """Remove one answer from the index."""
+        key = normalize(ref.text)
+        refs = self._refs.get(key)
+        if refs is None:
+            return
+        refs.discard(ref)
+        if refs:
+            return
+
+        del self._refs[key]
+        del self._shingles[key]
+        for band_key in self._band_keys.pop(key):
+            bucket = self._buckets[band_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band_key]
+
+    def update_file(self, path: Path, pool_cache: PoolCache | None = None):
+        """Index a protocol file, replacing what was indexed from it before."""
+        self.remove_file(path)
+        protocol = parse_protocol_file(path, pool_cache)
+
+        refs = []
+        for state in protocol.states.values():
+            if state.correct_answer is not None:
+                refs.append(
+                    AnswerRef(path, protocol.name, state.id, True, state.correct_answer)
+                )
+            refs.extend(
+                AnswerRef(path, protocol.name, state.id, False, text)
+                for text in state.wrong_answers
+            )
+        for ref in refs:
+            self.add(ref)
+        self._files[path] = (path.stat().st_mtime, refs)
+
+    def remove_file(self, path: Path):
+        """Remove every answer indexed from a file."""
+        _, refs = self._files.pop(path, (0.0, []))
+        for ref in refs:
+            self.remove(ref)
+
+    def refresh(self, directory: Path) -> int:
+        """Re-index the protocol files of a directory that changed.
+
+        New and modified files are (re)indexed and deleted files removed. If
+        a pool library changed, every file is re-indexed since any of them
+        may include it.
+
+        Returns:
+            Number of files (re)indexed or removed
+        """
+        paths = {path: path.stat().st_mtime for path in directory.glob("*.md")}
+        libraries = {p for p in paths if p.name.endswith(POOL_LIBRARY_SUFFIX)}
+        libraries_changed = any(
+            self._files.get(p, (None,))[0] != paths[p] for p in libraries
+        )
+        for library in libraries:
+            # Tracked only to notice changes
+            self._files[library] = (paths[library], [])
+
+        changed = 0
+        for path in [p for p in self._files if p not in paths]:
+            self.remove_file(path)
+            changed += 1
+
+        pool_cache: PoolCache = {}
+        for path, mtime in paths.items():
+            if path in libraries:
+                continue
+            if libraries_changed or self._files.get(path, (None,))[0] != mtime:
+                self.update_file(path, pool_cache)
+                changed += 1
+        return changed
+
+    def similarity(self, a: str, b: str) -> float:
+        """Exact Jaccard similarity of two indexed normalized texts."""
+        sa, sb = self._shingles[a], self._shingles[b]
+        return len(sa & sb) / len(sa | sb)
+
+    def clusters(self) -> list[DuplicateCluster]:
+        """Group near-duplicate answers.
+
+        Only answers sharing an LSH bucket are compared, and similar pairs
+        are merged with union-find. Returns clusters with more than one
+        distinct text, or with a wrong answer matching a correct answer.
+        """
+        parent = {key: key for key in self._refs}
+
+        def find(key: str) -> str:
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for bucket in self._buckets.values():
+            if len(bucket) < 2:
+                continue
+            members = list(bucket)
+            for i, a in enumerate(members):
+                for b in members[i + 1 :]:
+                    root_a, root_b = find(a), find(b)
+                    if root_a != root_b and self.similarity(a, b) >= self.threshold:
+                        parent[root_a] = root_b
+
+        groups: dict[str, list[AnswerRef]] = {}
+        for key, refs in self._refs.items():
+            groups.setdefault(find(key), []).extend(refs)
+
+        result = []
+        for refs in groups.values():
+            cluster = DuplicateCluster(
+                sorted(refs, key=lambda r: (r.protocol_name, r.state_id, r.text))
+            )
+            if len(cluster.texts) > 1 or cluster.conflicts:
+                result.append(cluster)
+        return result
+
+
+def main():
+    """Report near-duplicate answers in a protocol directory."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("data_dir", type=Path, nargs="?", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    args = parser.parse_args()
+
+    index = DistractorIndex(threshold=args.threshold)
+    index.refresh(args.data_dir)
+    clusters = index.clusters()
+
+    for cluster in clusters:
+        print("Near-duplicates:")
+        for ref in cluster.refs:
+            kind = "correct" if ref.correct else "wrong"
+            print(f"  [{ref.protocol_name} #{ref.state_id} {kind}] {ref.text}")
+        for wrong, right in cluster.conflicts:
+            print(
+                f"  CONFLICT: wrong answer of {wrong.protocol_name} "
+                f"#{wrong.state_id} matches the correct answer of "
+                f"{right.protocol_name} #{right.state_id}"
+            )
+        print()
+
+    conflicts = sum(len(cluster.conflicts) for cluster in clusters)
+    print(f"{len(clusters)} clusters, {conflicts} conflicts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Downsampling of long time series for plotting."""
+
+from collections.abc import Sequence
+
+Point = tuple[float, float]
+
+
+def lttb(points: Sequence[Point], threshold: int) -> list[Point]:
+    """Downsample points with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each of threshold - 2 buckets,
+    the point forming the largest triangle with its neighbours, which
+    preserves the visual shape of the series.
+
+    Args:
+        points: Points sorted by x
+        threshold: Maximum number of points to return
+
+    Returns:
+        At most threshold points
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        # Average of the next bucket is the third triangle vertex
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        next_points = points[next_start:next_end] or [points[-1]]
+        avg_x = sum(p[0] for p in next_points) / len(next_points)
+        avg_y = sum(p[1] for p in next_points) / len(next_points)
+
+        ax, ay = points[a]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+
+        sampled.append(points[best])
+        a = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+class MinMaxBuckets:
+    """Incremental min/max bucketing of an append-only series.
+
+    Points are grouped into buckets of equal size, each keeping its minimum
+    and maximum. When there are more than max_buckets buckets, adjacent
+    pairs are merged and the bucket size doubles, so appends are amortized
+    O(1) and the series never holds more than 2 * max_buckets points,
+    however long the input grows.
+    """
+
+    def __init__(self, max_buckets: int = 1024):
+        self.max_buckets = max_buckets
+        self.bucket_size = 1
+        self.count = 0
+        # Each bucket is [count, (x, y) of min, (x, y) of max]
+        self._buckets: list[list] = []
+        # Bumped on every change so renderers can cache their output
+        self.version = 0
+
+    def append(self, x: float, y: float):
+        """Append a point; x must not decrease."""
+        point = (x, y)
+        if self._buckets and self._buckets[-1][0] < self.bucket_size:
+            bucket = self._buckets[-1]
+            bucket[0] += 1
+            if y < bucket[1][1]:
+                bucket[1] = point
+            if y > bucket[2][1]:
+                bucket[2] = point
+        else:
+            self._buckets.append([1, point, point])
+            if len(self._buckets) > self.max_buckets:
+                self._merge()
+        self.count += 1
+        self.version += 1
+
+    def _merge(self):
+        """Merge adjacent buckets, doubling the bucket size."""
+        merged = []
+        for i in range(0, len(self._buckets), 2):
+            pair = self._buckets[i : i + 2]
+            low = min((b[1] for b in pair), key=lambda p: p[1])
+            high = max((b[2] for b in pair), key=lambda p: p[1])
+            merged.append([sum(b[0] for b in pair), low, high])
+        self._buckets = merged
+        self.bucket_size *= 2
+
+    def points(self) -> list[Point]:
+        """Get each bucket's min and max points, in x order."""
+        result: list[Point] = []
+        for _, low, high in self._buckets:
+            if low is high:
+                result.append(low)
+            elif low[0] <= high[0]:
+                result.extend((low, high))
+            else:
+                result.extend((high, low))
+        return result
@@ -0,0 +1,173 @@
+"""Typed event bus for gameplay events.
+
+GameplayController publishes an event object for everything that happens
+during a session. Any number of subscribers can listen to each event type:
+
+    subscribe        called synchronously, in order, from publish
+    subscribe_async  called on the bus's worker thread, so a slow subscriber
+                     (logging, metrics, disk) never delays the publisher
+
+High-frequency events that drive the UI can be wrapped in FrameCoalescer,
+which delivers only the latest event, once per Tk frame.
+"""
+
+import logging
+import queue
+import threading
+import tkinter as tk
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .models import State
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class StateChanged:
+    """A new state is on screen."""
+
+    state: State
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreUpdated:
+    """A question was answered, or start_game reset the score to (0, 0)."""
+
+    correct: int
+    total: int
+
+
+@dataclass(frozen=True, slots=True)
+class GameComplete:
+    """The session ended, at final_state or because a transition was missing."""
+
+    final_state: State | None
+    correct: int
+    total: int
+
+
+type Event = StateChanged | ScoreUpdated | GameComplete
+
+# Stops the worker thread
+_CLOSE = object()
+
+
+class EventBus:
+    """Publishes events to the subscribers of their type."""
+
+    def __init__(self):
+        # Tuples are replaced, not mutated, so publish can iterate safely
+        # while handlers subscribe or unsubscribe
+        self._sync: dict[type, tuple[Callable, ...]] = {}
+        self._async: dict[type, tuple[Callable, ...]] = {}
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def subscribe[E: Event](
+        self, event_type: type[E], handler: Callable[[E], None]
+    ) -> Callable[[], None]:
+        """Call handler synchronously for every event of event_type.
+
+        Handlers run on the publishing thread before publish returns and
+        their exceptions propagate to the publisher, so keep them cheap.
+
+        Returns:
+            A function that removes the subscription
+        """
+        return self._add(self._sync, event_type, handler)
+
+    def subscribe_async[E: Event](
+        self, event_type: type[E], handler: Callable[[E], None]
+    ) -> Callable[[], None]:
+        """Call handler on the bus's worker thread for events of event_type.
+
+        Handlers see events in publish order. Exceptions are logged. Handlers
+        must not touch Tk widgets, which are not thread-safe.
+
+        Returns:
+            A function that removes the subscription
+        """
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="event-bus", daemon=True
+                )
+                self._worker.start()
+        return self._add(self._async, event_type, handler)
+
+    def _add(
+        self,
+        handlers: dict[type, tuple[Callable, ...]],
+        event_type: type,
+        handler: Callable,
+    ) -> Callable[[], None]:
+        with self._lock:
+            handlers[event_type] = handlers.get(event_type, ()) + (handler,)
+
+        def unsubscribe():
+            with self._lock:
+                remaining = list(handlers.get(event_type, ()))
+                if handler in remaining:
+                    remaining.remove(handler)
+                    handlers[event_type] = tuple(remaining)
+
+        return unsubscribe
+
+    def publish(self, event: Event):
+        """Deliver an event to its subscribers.
+
+        Async subscribers are only queued here; the cost to the publisher is
+        independent of how long they take.
+        """
+        event_type = type(event)
+        for handler in self._async.get(event_type, ()):
+            self._queue.put((handler, event))
+        for handler in self._sync.get(event_type, ()):
+            handler(event)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _CLOSE:
+                return
+            handler, event = item
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Event subscriber %r failed on %r", handler, event)
+
+    def close(self, timeout: float | None = None):
+        """Stop the worker thread once it has delivered the queued events."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(_CLOSE)
+            worker.join(timeout)
+
+
+class FrameCoalescer[E: Event]:
+    """Subscriber that hands only the latest event to handler, once per frame.
+
+    Subscribe it synchronously from the Tk thread: each call only stores the
+    event, and the first call of a frame schedules one after_idle flush.
+    """
+
+    def __init__(self, root: tk.Misc, handler: Callable[[E], None]):
+        self.root = root
+        self.handler = handler
+        self._latest: E | None = None
+        self._pending = False
+
+    def __call__(self, event: E):
+        self._latest = event
+        if not self._pending:
+            self._pending = True
+            self.root.after_idle(self._flush)
+
+    def _flush(self):
+        self._pending = False
+        event, self._latest = self._latest, None
+        if event is not None:
+            self.handler(event)
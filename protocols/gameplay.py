@@ -1,54 +1,166 @@
 """Gameplay controller for the protocol practice game."""
 
-from collections.abc import Callable
+import random
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 
+from .events import EventBus, GameComplete, ScoreUpdated, StateChanged
+from .library import ProtocolLibrary
 from .models import Protocol, State, StateType
 
 
+@dataclass
+class PreparedState:
+    """A state with its answer options sampled and formatted ahead of display."""
+
+    state: State
+    protocol: Protocol | None = None
+    options: list[str] = field(default_factory=list)
+    labels: list[str] = field(default_factory=list)
+
+
+def prepare_state(
+    state: State,
+    protocol: Protocol | None = None,
+    rng: random.Random | None = None,
+) -> PreparedState:
+    """Sample and shuffle a state's options and build their button labels.
+
+    Args:
+        state: The state to prepare
+        protocol: The protocol the state belongs to, if known
+        rng: Random generator to sample with (global random if None)
+
+    Returns:
+        A PreparedState ready to be swapped onto the screen
+    """
+    options: list[str] = []
+    if state.state_type == StateType.QUESTION:
+        options = state.get_shuffled_options(rng)
+    labels = [f"{i + 1}. {option}" for i, option in enumerate(options)]
+    return PreparedState(state=state, protocol=protocol, options=options, labels=labels)
+
+
 class GameplayController:
     """Event-driven controller for gameplay logic.
 
-    Manages game state and emits events via callbacks.
+    Manages game state and publishes events on an EventBus; the callbacks
+    given to the constructor are its first synchronous subscribers.
     Has no knowledge of UI implementation.
     """
 
     def __init__(
         self,
-        protocols: dict[str, Protocol],
-        on_state_changed: Callable[[State], None],
-        on_game_complete: Callable[[State, int, int], None],
-        on_score_updated: Callable[[int, int], None],
+        protocols: Mapping[str, Protocol] | ProtocolLibrary,
+        on_state_changed: Callable[[State], None] | None = None,
+        on_game_complete: Callable[[State, int, int], None] | None = None,
+        on_score_updated: Callable[[int, int], None] | None = None,
+        rng: random.Random | None = None,
+        events: EventBus | None = None,
     ):
         """Initialize the gameplay controller.
 
         Args:
-            protocols: Dictionary mapping protocol names to Protocol objects
+            protocols: Mapping of protocol names to Protocol objects, or a
+                ProtocolLibrary whose current snapshot each session pins
             on_state_changed: Called when state changes (State)
             on_game_complete: Called when game ends (final_state, correct, total)
-            on_score_updated: Called when score changes (correct, total)
+            on_score_updated: Called when score changes (correct, total),
+                including with (0, 0) when start_game resets the score
+            rng: Random generator used for all sampling; reseeded per session
+            events: Bus to publish StateChanged, ScoreUpdated and GameComplete
+                on; more subscribers can be added through self.events
         """
-        self.protocols = protocols
-        self.on_state_changed = on_state_changed
-        self.on_game_complete = on_game_complete
-        self.on_score_updated = on_score_updated
+        self.library = protocols if isinstance(protocols, ProtocolLibrary) else None
+        # The protocols of the current session
+        self.protocols: Mapping[str, Protocol] = (
+            protocols.current if self.library is not None else protocols
+        )
+        self.rng = rng or random.Random()
+
+        self.events = events or EventBus()
+        if on_state_changed is not None:
+            self.events.subscribe(StateChanged, lambda e: on_state_changed(e.state))
+        if on_game_complete is not None:
+            self.events.subscribe(
+                GameComplete,
+                lambda e: on_game_complete(e.final_state, e.correct, e.total),
+            )
+        if on_score_updated is not None:
+            self.events.subscribe(
+                ScoreUpdated, lambda e: on_score_updated(e.correct, e.total)
+            )
 
         self.current_protocol: Protocol | None = None
         self.current_state: State | None = None
+        self.current_prepared: PreparedState | None = None
         self.correct_answers = 0
         self.total_questions = 0
 
-    def start_game(self, protocol_name: str):
-        """Start a new game with the specified protocol."""
+        # Recorded so a session can be replayed deterministically
+        self.session_seed: int | None = None
+        self.answer_log: list[str] = []
+        self.answer_results: list[bool] = []
+        self.visited_states: list[tuple[str, int]] = []
+
+        # Forced next-state choices of a planned session, taken in order
+        self.plan: list[int | str] | None = None
+        self._planned_choices: deque[int | str] = deque()
+
+        # Next-state id -> prepared state (None if it doesn't resolve)
+        self._prefetched: dict[int | str, PreparedState | None] | None = None
+
+    def start_game(
+        self,
+        protocol_name: str,
+        seed: int | None = None,
+        plan: list[int | str] | None = None,
+    ):
+        """Start a new game with the specified protocol.
+
+        Args:
+            protocol_name: Name of the protocol to play
+            seed: Seed for the session's random choices; a fresh one is drawn
+                if None. Replaying the same seed and answers reproduces the
+                session exactly.
+            plan: Next-state ids to take in order instead of choosing at
+                random (see protocols.planner); random choice resumes once
+                the plan runs out
+        """
+        if self.library is not None:
+            # Pin the latest version; reloads during the session don't affect it
+            self.protocols = self.library.current
         if protocol_name not in self.protocols:
             raise ValueError(f"Unknown protocol: {protocol_name}")
 
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.session_seed = seed
+        self.rng.seed(seed)
+        self.answer_log = []
+        self.answer_results = []
+        self.visited_states = []
+        self.plan = list(plan) if plan is not None else None
+        self._planned_choices = deque(plan or [])
+
         self.current_protocol = self.protocols[protocol_name]
         self.current_state = self.current_protocol.get_initial_state()
+        self.current_prepared = None
+        self._prefetched = None
         self.correct_answers = 0
         self.total_questions = 0
+        # Lets score displays clear the previous game's score
+        self.events.publish(ScoreUpdated(0, 0))
 
         if self.current_state:
-            self.on_state_changed(self.current_state)
+            self.current_prepared = prepare_state(
+                self.current_state, self.current_protocol, self.rng
+            )
+            self.visited_states.append(
+                (self.current_protocol.name, self.current_state.id)
+            )
+            self.events.publish(StateChanged(self.current_state))
 
     def handle_answer(self, answer: str) -> bool:
         """Handle a user's answer.
@@ -62,59 +174,152 @@ class GameplayController:
         if self.current_state is None:
             return False
 
+        self.answer_log.append(answer)
         is_correct = answer == self.current_state.correct_answer
+        self.answer_results.append(is_correct)
         self.total_questions += 1
         if is_correct:
             self.correct_answers += 1
 
-        self.on_score_updated(self.correct_answers, self.total_questions)
+        self.events.publish(ScoreUpdated(self.correct_answers, self.total_questions))
         return is_correct
 
+    def prefetch_next_states(self):
+        """Resolve and prepare every possible next state of the current state.
+
+        Safe to call repeatedly; the work is done once per state. Intended to
+        run while feedback is on screen so that advancing only swaps in
+        prepared data.
+        """
+        if self.current_state is None or self.current_protocol is None:
+            return
+        if self._prefetched is not None:
+            return
+
+        prefetched: dict[int | str, PreparedState | None] = {}
+        for next_id in self.current_state.next_state_ids:
+            if next_id not in prefetched:
+                prefetched[next_id] = self._resolve_next_state(next_id)
+        self._prefetched = prefetched
+
+    def _resolve_next_state(self, next_id: int | str) -> PreparedState | None:
+        """Resolve a next-state id to a prepared state, or None if missing."""
+        if isinstance(next_id, str):
+            # Switch to a different protocol
+            protocol = self.protocols.get(next_id)
+            state = protocol.get_initial_state() if protocol else None
+        else:
+            # Stay in current protocol
+            protocol = self.current_protocol
+            state = protocol.get_state(next_id) if protocol else None
+
+        if state is None:
+            return None
+        return prepare_state(state, protocol, self.rng)
+
     def advance_to_next_state(self):
         """Advance to the next state in the protocol."""
         if self.current_state is None or self.current_protocol is None:
             return
 
-        next_id = self.current_state.get_random_next_state_id()
+        # Always prefetch before choosing so the order of random draws is the
+        # same whether or not the UI prefetched while showing feedback.
+        self.prefetch_next_states()
+        prefetched = self._prefetched or {}
+        self._prefetched = None
+
+        if self._planned_choices and self.current_state.next_state_ids:
+            next_id = self._planned_choices.popleft()
+            if next_id not in self.current_state.next_state_ids:
+                raise ValueError(
+                    f"Planned transition {next_id!r} is not available from "
+                    f"state {self.current_state.id}"
+                )
+        else:
+            next_id = self.current_state.get_random_next_state_id(self.rng)
 
         if next_id is None:
             # No next state - this is a final state
-            self.on_game_complete(
-                self.current_state, self.correct_answers, self.total_questions
-            )
+            self._complete()
             return
 
-        if isinstance(next_id, str):
-            # Switch to a different protocol
-            if next_id in self.protocols:
-                self.current_protocol = self.protocols[next_id]
-                self.current_state = self.current_protocol.get_initial_state()
-            else:
+        prepared = prefetched.get(next_id)
+        if prepared is None:
+            if isinstance(next_id, str):
                 # Protocol not found, treat as game complete
-                self.on_game_complete(
-                    self.current_state, self.correct_answers, self.total_questions
-                )
-                return
-        else:
-            # Stay in current protocol
-            self.current_state = self.current_protocol.get_state(next_id)
-
-        if self.current_state:
-            # Check if new state is FINAL
-            if self.current_state.state_type == StateType.FINAL:
-                self.on_game_complete(
-                    self.current_state, self.correct_answers, self.total_questions
-                )
+                self._complete()
             else:
-                self.on_state_changed(self.current_state)
+                # State not found, end game
+                self.current_state = None
+                self.current_prepared = None
+                self._complete()
+            return
+
+        if prepared.protocol is not None:
+            self.current_protocol = prepared.protocol
+        self.current_state = prepared.state
+        self.current_prepared = prepared
+        self.visited_states.append((self.current_protocol.name, self.current_state.id))
+
+        # Check if new state is FINAL
+        if self.current_state.state_type == StateType.FINAL:
+            self._complete()
         else:
-            # State not found, end game
-            self.on_game_complete(
-                self.current_state, self.correct_answers, self.total_questions
-            )
+            self.events.publish(StateChanged(self.current_state))
+
+    def _complete(self):
+        """Publish the end of the session."""
+        self.events.publish(
+            GameComplete(self.current_state, self.correct_answers, self.total_questions)
+        )
 
     def get_current_correct_answer(self) -> str | None:
         """Get the correct answer for the current state."""
         if self.current_state:
             return self.current_state.correct_answer
         return None
+
+
+def play_session(
+    controller: GameplayController,
+    protocol_name: str,
+    choose_answer: Callable[[PreparedState], str],
+    seed: int | None = None,
+    plan: list[int | str] | None = None,
+    advance: Callable[[], None] | None = None,
+):
+    """Play one session headlessly, from start_game until it completes.
+
+    Args:
+        controller: The controller to play on
+        protocol_name: Name of the protocol to play
+        choose_answer: Picks the answer for each question from its prepared
+            options; raising aborts the session with that exception
+        seed: Seed for the session (see GameplayController.start_game)
+        plan: Planned next-state choices (see GameplayController.start_game)
+        advance: Called instead of controller.advance_to_next_state for each
+            step, e.g. to time it
+
+    Raises:
+        ValueError: If the protocol is unknown or a planned transition is
+            not available
+    """
+    finished = False
+
+    def on_game_complete(_event: GameComplete):
+        nonlocal finished
+        finished = True
+
+    unsubscribe = controller.events.subscribe(GameComplete, on_game_complete)
+    try:
+        controller.start_game(protocol_name, seed=seed, plan=plan)
+        while not finished and controller.current_state is not None:
+            prepared = controller.current_prepared
+            if (
+                controller.current_state.state_type == StateType.QUESTION
+                and prepared is not None
+            ):
+                controller.handle_answer(choose_answer(prepared))
+            (advance or controller.advance_to_next_state)()
+    finally:
+        unsubscribe()
@@ -0,0 +1,138 @@
+"""Per-trainee answer history and accuracy trends."""
+
+import hashlib
+import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from .downsample import MinMaxBuckets
+
+# Trainee names used as their history file name unchanged
+_PLAIN_NAME = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_.-]{0,63}")
+_NOT_PLAIN = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class AccuracySeries:
+    """Rolling accuracy over a trainee's answers, kept downsampled.
+
+    Each answer adds one point: the accuracy over the last window answers.
+    Points are bucketed as they arrive, so memory and rendering cost stay
+    bounded however long the history is.
+    """
+
+    def __init__(self, window: int = 50, max_buckets: int = 1024):
+        self.window = window
+        self.buckets = MinMaxBuckets(max_buckets)
+        self._recent: deque[bool] = deque(maxlen=window)
+        self._recent_correct = 0
+
+    def __len__(self) -> int:
+        return self.buckets.count
+
+    @property
+    def version(self) -> int:
+        """Changes whenever answers are appended."""
+        return self.buckets.version
+
+    def append(self, correct: bool):
+        """Add one answer to the series."""
+        if len(self._recent) == self.window and self._recent[0]:
+            self._recent_correct -= 1
+        self._recent.append(correct)
+        if correct:
+            self._recent_correct += 1
+        self.buckets.append(len(self), self._recent_correct / len(self._recent))
+
+    def extend(self, results: list[bool]):
+        """Add a session's answers to the series."""
+        for correct in results:
+            self.append(correct)
+
+
+class ScoreHistory:
+    """Answer histories of all trainees, optionally persisted.
+
+    Each trainee's answers are stored in <directory>/<trainee>.txt as one
+    "1" (correct) or "0" (wrong) per answer, and appended to after every
+    session. Names that aren't safe as a file name (see history_filename)
+    are stored under an encoded one.
+
+    Reading a long history takes a noticeable fraction of a second; call
+    preload when the trainee logs in so the results screen never waits on
+    it.
+    """
+
+    def __init__(self, directory: Path | None = None, window: int = 50):
+        """Initialize the history.
+
+        Args:
+            directory: Where histories are stored; kept in memory if None
+            window: Number of answers the rolling accuracy is computed over
+        """
+        self.directory = directory
+        self.window = window
+        self._series: dict[str, AccuracySeries] = {}
+        self._loading: dict[str, Future[AccuracySeries]] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _path(self, trainee: str) -> Path | None:
+        if self.directory is None:
+            return None
+        return self.directory / history_filename(trainee)
+
+    def _load(self, trainee: str) -> AccuracySeries:
+        """Build a trainee's series from their stored answers."""
+        series = AccuracySeries(self.window)
+        path = self._path(trainee)
+        if path is not None and path.exists():
+            series.extend([char == "1" for char in path.read_text().strip()])
+        return series
+
+    def preload(self, trainee: str):
+        """Start loading a trainee's history on a background thread."""
+        if trainee in self._series or trainee in self._loading:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="history-load"
+            )
+        self._loading[trainee] = self._executor.submit(self._load, trainee)
+
+    def series(self, trainee: str) -> AccuracySeries:
+        """Get a trainee's accuracy series.
+
+        Waits for a load started by preload if it hasn't finished, and loads
+        on the calling thread if none was started.
+        """
+        if trainee not in self._series:
+            future = self._loading.pop(trainee, None)
+            self._series[trainee] = (
+                future.result() if future is not None else self._load(trainee)
+            )
+        return self._series[trainee]
+
+    def append_session(self, trainee: str, results: list[bool]):
+        """Record the answers of a finished session."""
+        self.series(trainee).extend(results)
+
+        path = self._path(trainee)
+        if path is not None and results:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a") as f:
+                f.write("".join("1" if correct else "0" for correct in results))
+
+
+def history_filename(trainee: str) -> str:
+    """The file a trainee's answers are stored in, inside the directory.
+
+    Names of up to 64 letters, digits, "_", "." and "-" not starting with "."
+    are used as they are. Anything else, which could contain path separators,
+    ".." or characters the OS rejects, becomes a slug of the safe characters
+    plus a hash of the full name; the "+" keeps these apart from plain names.
+    """
+    if _PLAIN_NAME.fullmatch(trainee):
+        return f"{trainee}.txt"
+    slug = _NOT_PLAIN.sub("_", trainee).strip("._")[:32]
+    digest = hashlib.sha256(trainee.encode()).hexdigest()[:16]
+    return f"{slug}+{digest}.txt"
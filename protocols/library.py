@@ -0,0 +1,116 @@
+"""Versioned, immutable snapshots of the protocol library.
+
+A ProtocolLibrary always points at one LibrarySnapshot. Readers take the
+current snapshot with a plain attribute read and never lock. Writers load
+a complete new library (off-thread with reload_async) and publish it by
+swapping that single reference, so a reader sees either the old version or
+the new one, never a mix. Snapshots are read-only mappings of Protocol
+objects, which are immutable along with their states; a session that pins
+a snapshot keeps playing the version it started on however many reloads
+happen meanwhile.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+
+from .models import Protocol
+from .parser import load_protocols_from_directory
+
+
+class LibrarySnapshot(Mapping[str, Protocol]):
+    """One published version of the library: a read-only name -> Protocol map."""
+
+    __slots__ = ("version", "published_at", "_protocols")
+
+    def __init__(self, version: int, protocols: Mapping[str, Protocol]):
+        self.version = version
+        self.published_at = time.time()
+        # Copied so later changes to the caller's dict can't leak in
+        self._protocols = MappingProxyType(dict(protocols))
+
+    def __getitem__(self, name: str) -> Protocol:
+        return self._protocols[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._protocols)
+
+    def __len__(self) -> int:
+        return len(self._protocols)
+
+    def __repr__(self) -> str:
+        return f"LibrarySnapshot(version={self.version}, protocols={len(self)})"
+
+
+class ProtocolLibrary:
+    """The current library snapshot, replaced atomically on reload."""
+
+    def __init__(
+        self,
+        directory: Path,
+        protocols: Mapping[str, Protocol] | None = None,
+    ):
+        """Initialize the library.
+
+        Args:
+            directory: Directory containing protocol markdown files
+            protocols: Initial protocols; loaded from directory if None
+        """
+        self.directory = directory
+        if protocols is None:
+            protocols = load_protocols_from_directory(directory)
+        self._current = LibrarySnapshot(1, protocols)
+        # Serializes writers only; readers never take it
+        self._publish_lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def current(self) -> LibrarySnapshot:
+        """The latest published snapshot."""
+        return self._current
+
+    def publish(self, protocols: Mapping[str, Protocol]) -> LibrarySnapshot:
+        """Publish a new version built from protocols."""
+        with self._publish_lock:
+            snapshot = LibrarySnapshot(self._current.version + 1, protocols)
+            self._current = snapshot
+        return snapshot
+
+    def reload(self) -> LibrarySnapshot:
+        """Load the directory again and publish the result."""
+        return self.publish(load_protocols_from_directory(self.directory))
+
+    def reload_async(
+        self, on_published: Callable[[LibrarySnapshot], None] | None = None
+    ) -> Future[LibrarySnapshot]:
+        """Reload on a background thread.
+
+        Args:
+            on_published: Called on the background thread with the new
+                snapshot; Tk callers should poll the returned future instead
+
+        Returns:
+            A future for the published snapshot; it holds the exception if
+            loading failed, in which case the current snapshot is unchanged
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="library-reload"
+            )
+
+        def reload() -> LibrarySnapshot:
+            snapshot = self.reload()
+            if on_published is not None:
+                on_published(snapshot)
+            return snapshot
+
+        return self._executor.submit(reload)
+
+    def close(self):
+        """Wait for a pending reload and stop the background thread."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
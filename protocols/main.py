@@ -1,16 +1,133 @@
 """Main entry point for the EMS Protocols Practice Game."""
 
+import argparse
 import tkinter as tk
+from pathlib import Path
 
 from .controller import App
+from .parser import DEFAULT_DATA_DIR, load_protocols_from_directory
+from .profiling import run_headless_sessions, run_profiled
+from .watchdog import StallWatchdog
 
 
 def main():
     """Run the EMS Protocols Practice Game."""
+    parser = argparse.ArgumentParser(description="EMS Protocol Practice")
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=DEFAULT_DATA_DIR,
+        metavar="PATH",
+        help="directory of protocol files to practice",
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="append completed sessions to PATH for replay",
+    )
+    parser.add_argument(
+        "--trainee",
+        default="trainee",
+        help="name the score history is kept under",
+    )
+    parser.add_argument(
+        "--history-dir",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="directory to persist score histories in",
+    )
+    parser.add_argument(
+        "--stall-threshold",
+        type=float,
+        default=0.5,
+        metavar="SECONDS",
+        help="log UI stalls longer than SECONDS (0 disables the watchdog)",
+    )
+    parser.add_argument(
+        "--measure-startup",
+        action="store_true",
+        help="print the time to the first interactive frame and exit",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="PREFIX",
+        help="profile the run and write PREFIX.pstats, PREFIX.collapsed "
+        "and PREFIX.subsystems.txt on exit",
+    )
+    parser.add_argument(
+        "--headless",
+        default=None,
+        metavar="PROTOCOL",
+        help="play PROTOCOL with random answers without a window "
+        "(for use with --profile)",
+    )
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        default=1000,
+        help="number of headless sessions to play",
+    )
+    args = parser.parse_args()
+
+    if args.headless is not None:
+
+        def run_headless():
+            protocols = load_protocols_from_directory(args.data_dir)
+            if args.headless not in protocols:
+                parser.error(f"unknown protocol: {args.headless}")
+            run_headless_sessions(protocols, args.headless, args.sessions)
+
+        if args.profile is not None:
+            run_profiled(run_headless, args.profile)
+        else:
+            run_headless()
+        return
+
+    if args.profile is not None:
+        run_profiled(lambda: run_app(args), args.profile)
+    else:
+        run_app(args)
+
+
+def run_app(args: argparse.Namespace):
+    """Create the window and run the Tk main loop until it is closed."""
     root = tk.Tk()
-    App(root)
+    app = App(
+        root,
+        data_dir=args.data_dir,
+        session_log=args.record,
+        trainee=args.trainee,
+        history_dir=args.history_dir,
+    )
+
+    if args.measure_startup:
+        # Wait until the app has recorded its first painted frame
+        def report_startup():
+            if app.startup_seconds is None:
+                root.after(5, report_startup)
+                return
+            print(f"startup_seconds={app.startup_seconds:.6f}")
+            root.destroy()
+
+        report_startup()
+        root.mainloop()
+        return
+
+    watchdog = None
+    if args.stall_threshold > 0:
+        watchdog = StallWatchdog(root, threshold=args.stall_threshold)
+        watchdog.start()
+
     root.mainloop()
 
+    if watchdog is not None:
+        watchdog.stop()
+
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,5 @@
+from .alias import AliasTable
 from .state import State, StateType
 from .protocol import Protocol
 
-__all__ = ["State", "StateType", "Protocol"]
+__all__ = ["AliasTable", "State", "StateType", "Protocol"]
@@ -0,0 +1,91 @@
+from collections.abc import Sequence
+import random
+
+
+class AliasTable:
+    """Walker/Vose alias table for O(1) sampling from a discrete distribution.
+
+    Built once in O(n); each sample then takes a single rng.random() draw.
+    """
+
+    __slots__ = ("weights", "_probabilities", "_aliases")
+
+    def __init__(self, weights: Sequence[float]):
+        """Build the table.
+
+        Args:
+            weights: Positive relative weight of each outcome
+        """
+        if not weights:
+            raise ValueError("AliasTable needs at least one weight")
+        if any(not 0 < weight < float("inf") for weight in weights):
+            raise ValueError(f"Weights must be positive: {list(weights)}")
+
+        n = len(weights)
+        total = sum(weights)
+        scaled = [weight * n / total for weight in weights]
+        probabilities = [1.0] * n
+        aliases = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1 up to rounding error and keeps probability 1
+
+        # Tuples, so tables shared between states and snapshots can't change
+        self.weights = tuple(weights)
+        self._probabilities = tuple(probabilities)
+        self._aliases = tuple(aliases)
+
+    @classmethod
+    def from_tables(
+        cls,
+        weights: Sequence[float],
+        probabilities: Sequence[float],
+        aliases: Sequence[int],
+    ) -> "AliasTable":
+        """Rebuild a table from the output of tables() without redoing Vose."""
+        table = cls.__new__(cls)
+        table.weights = tuple(weights)
+        table._probabilities = tuple(probabilities)
+        table._aliases = tuple(aliases)
+        return table
+
+    def tables(self) -> tuple[tuple[float, ...], tuple[int, ...]]:
+        """The acceptance probability and alias of each column."""
+        return self._probabilities, self._aliases
+
+    def __len__(self) -> int:
+        return len(self._probabilities)
+
+    def probabilities(self) -> list[float]:
+        """The normalized probability of each outcome."""
+        total = sum(self.weights)
+        return [weight / total for weight in self.weights]
+
+    def sample(self, rng: random.Random | None = None) -> int:
+        """Draw one outcome index.
+
+        Uses rng if given, otherwise the global random module.
+        """
+        n = len(self._probabilities)
+        u = (rng or random).random() * n
+        i = min(int(u), n - 1)
+        return i if u - i < self._probabilities[i] else self._aliases[i]
+
+    def sample_many(self, k: int, rng: random.Random | None = None) -> list[int]:
+        """Draw k outcome indices, for batch simulation."""
+        n = len(self._probabilities)
+        probabilities, aliases = self._probabilities, self._aliases
+        draws = (rng or random).random
+        result = []
+        for _ in range(k):
+            u = draws() * n
+            i = min(int(u), n - 1)
+            result.append(i if u - i < probabilities[i] else aliases[i])
+        return result
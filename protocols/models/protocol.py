@@ -1,14 +1,30 @@
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from types import MappingProxyType
 
 from .state import State
 
 
-@dataclass
+@dataclass(frozen=True)
 class Protocol:
-    """A protocol consisting of states forming a state machine."""
+    """A protocol consisting of states forming a state machine.
+
+    Immutable, like its states: states is a read-only view of a private copy
+    of the mapping passed in.
+    """
 
     name: str
-    states: dict[int, State] = field(default_factory=dict)
+    states: Mapping[int, State] = field(default_factory=dict)
+    # Hash of the file (and included pool libraries) it was parsed from;
+    # changes whenever anything that affects how it plays changes
+    fingerprint: str | None = field(default=None, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "states", MappingProxyType(dict(self.states)))
+
+    def __reduce__(self):
+        # MappingProxyType can't be pickled; rebuild from a plain dict
+        return (Protocol, (self.name, dict(self.states), self.fingerprint))
 
     def get_initial_state(self) -> State | None:
         """Get the initial state (state with id 0)."""
@@ -2,6 +2,8 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 import random
 
+from .alias import AliasTable
+
 
 class StateType(Enum):
     """Type of state in the protocol state machine."""
@@ -11,33 +13,85 @@ class StateType(Enum):
     FINAL = auto()  # Terminal state, triggers results screen
 
 
-@dataclass
+@dataclass(frozen=True)
 class State:
-    """A state in the protocol state machine."""
+    """A state in the protocol state machine.
+
+    Immutable: sequences passed in are stored as tuples, so a State can be
+    shared between library snapshots and sessions without copying.
+    """
 
     id: int
     description: str
     state_type: StateType
     correct_answer: str | None = None
-    wrong_answers: list[str] = field(default_factory=list)
-    next_state_ids: list[int | str] = field(default_factory=list)
+    # Shared with other states when it comes from an answer pool
+    wrong_answers: tuple[str, ...] = ()
+    next_state_ids: tuple[int | str, ...] = ()
+    # Relative weight of each entry of next_state_ids; uniform if None
+    next_state_weights: tuple[float, ...] | None = None
+    # Built from next_state_weights unless given precomputed
+    transition_table: AliasTable | None = field(
+        default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        # tuple() returns tuples unchanged, so shared pools stay shared
+        object.__setattr__(self, "wrong_answers", tuple(self.wrong_answers))
+        object.__setattr__(self, "next_state_ids", tuple(self.next_state_ids))
+        if self.next_state_weights is not None:
+            object.__setattr__(
+                self, "next_state_weights", tuple(self.next_state_weights)
+            )
+            if len(self.next_state_weights) != len(self.next_state_ids):
+                raise ValueError(
+                    f"State {self.id} has {len(self.next_state_ids)} next states "
+                    f"but {len(self.next_state_weights)} weights"
+                )
+            if self.transition_table is None:
+                object.__setattr__(
+                    self, "transition_table", AliasTable(self.next_state_weights)
+                )
+
+    def sample_wrong_answers(
+        self, n: int = 3, rng: random.Random | None = None
+    ) -> list[str]:
+        """Sample n wrong answers from the available pool.
 
-    def sample_wrong_answers(self, n: int = 3) -> list[str]:
-        """Sample n wrong answers from the available pool."""
+        Uses rng if given, otherwise the global random module.
+        """
         if len(self.wrong_answers) <= n:
-            return self.wrong_answers.copy()
-        return random.sample(self.wrong_answers, n)
+            return list(self.wrong_answers)
+        return (rng or random).sample(self.wrong_answers, n)
 
-    def get_shuffled_options(self) -> list[str]:
+    def get_shuffled_options(self, rng: random.Random | None = None) -> list[str]:
         """Get 4 shuffled options: 1 correct + 3 wrong answers."""
         if self.correct_answer is None:
             return []
-        options = [self.correct_answer] + self.sample_wrong_answers(3)
-        random.shuffle(options)
+        options = [self.correct_answer] + self.sample_wrong_answers(3, rng)
+        (rng or random).shuffle(options)
         return options
 
-    def get_random_next_state_id(self) -> int | str | None:
-        """Get a random next state ID from available transitions."""
+    def get_random_next_state_id(
+        self, rng: random.Random | None = None
+    ) -> int | str | None:
+        """Get a random next state ID from available transitions.
+
+        Weighted states sample their alias table in O(1); unweighted states
+        choose uniformly.
+        """
         if not self.next_state_ids:
             return None
-        return random.choice(self.next_state_ids)
+        if self.transition_table is not None:
+            return self.next_state_ids[self.transition_table.sample(rng)]
+        return (rng or random).choice(self.next_state_ids)
+
+    def transition_probabilities(self) -> list[tuple[int | str, float]]:
+        """Each next state ID with the probability of taking it."""
+        if not self.next_state_ids:
+            return []
+        if self.transition_table is not None:
+            probabilities = self.transition_table.probabilities()
+        else:
+            probabilities = [1 / len(self.next_state_ids)] * len(self.next_state_ids)
+        return list(zip(self.next_state_ids, probabilities))
@@ -1,28 +1,146 @@
 """Parser for markdown protocol files."""
 
+import hashlib
+import re
+from dataclasses import replace
 from pathlib import Path
 
 from .models import Protocol, State, StateType
 
+# Protocol files shipped with the package
+DEFAULT_DATA_DIR = Path(__file__).parent / "data"
 
-def parse_protocol_file(filepath: Path) -> Protocol:
+# Shared pool library files; included by protocol files, never loaded as protocols
+POOL_LIBRARY_SUFFIX = ".pools.md"
+
+POOL_HEADER = "## Pool:"
+INCLUDE_HEADER = "# Include:"
+POOL_REFERENCE_PREFIX = "@"
+
+# Optional numeric transition weight after a next state, e.g. "3 [4]" or
+# "3 [0.5]"; other brackets, as in "CPR [adult]", are part of the name
+_TRANSITION_WEIGHT = re.compile(r"^(.*?)\s*\[(\d+(?:\.\d+)?)\]$")
+
+# Library path -> the pools it declares and its fingerprint (None while it
+# is being parsed)
+PoolCache = dict[Path, tuple[dict[str, tuple[str, ...]], str] | None]
+
+
+def _parse_include(
+    line: str, base_dir: Path, pool_cache: PoolCache
+) -> tuple[dict[str, tuple[str, ...]], str]:
+    """Load the pools and fingerprint of an include directive's library,
+    relative to base_dir."""
+    target = (base_dir / line[len(INCLUDE_HEADER) :].strip()).resolve()
+    return _load_pool_library(target, pool_cache)
+
+
+def parse_pool_library(
+    filepath: Path, pool_cache: PoolCache | None = None
+) -> dict[str, tuple[str, ...]]:
+    """Parse a shared library of named wrong answer pools.
+
+    Each library file is parsed once per pool_cache, so every protocol that
+    includes it shares the same pools. Pools are tuples, so nothing that
+    shares one can change it.
+
+    Format:
+        # Include: other.pools.md
+        ## Pool: pool-name
+        Wrong answer 1
+        Wrong answer 2
+    """
+    return _load_pool_library(filepath, {} if pool_cache is None else pool_cache)[0]
+
+
+def _load_pool_library(
+    filepath: Path, pool_cache: PoolCache
+) -> tuple[dict[str, tuple[str, ...]], str]:
+    """Parse a pool library (see parse_pool_library) and fingerprint it.
+
+    The fingerprint covers the bytes parsed here and the fingerprints of
+    the libraries it includes.
+    """
+    filepath = filepath.resolve()
+    if filepath in pool_cache:
+        cached = pool_cache[filepath]
+        if cached is None:
+            raise ValueError(f"Circular include of {filepath}")
+        return cached
+
+    pool_cache[filepath] = None
+    pools: dict[str, list[str] | tuple[str, ...]] = {}
+    current_pool: list[str] | None = None
+    data = filepath.read_bytes()
+    digest = hashlib.sha256(data)
+
+    for line in data.decode().split("\n"):
+        line = line.strip()
+        if line.startswith(INCLUDE_HEADER):
+            included, fingerprint = _parse_include(line, filepath.parent, pool_cache)
+            pools.update(included)
+            digest.update(fingerprint.encode())
+            current_pool = None
+        elif line.startswith(POOL_HEADER):
+            current_pool = pools[line[len(POOL_HEADER) :].strip()] = []
+        elif not line:
+            current_pool = None
+        elif current_pool is not None:
+            current_pool.append(line)
+
+    frozen = {name: tuple(answers) for name, answers in pools.items()}
+    pool_cache[filepath] = frozen, digest.hexdigest()[:16]
+    return pool_cache[filepath]
+
+
+def parse_protocol_file(
+    filepath: Path, pool_cache: PoolCache | None = None
+) -> Protocol:
     """Parse a markdown protocol file into a Protocol object.
 
     Format:
         Protocol Name
         ================================
+        # Include: shared.pools.md
+        ## Pool: pool-name
+        Shared wrong answer 1
+        Shared wrong answer 2
+
         0: State description
         # Correct answer:
         Answer text
         # Wrong answers:
         Wrong answer 1
         Wrong answer 2
+        @pool-name
         # Next state:
-        1
+        1 [3]
         2
+
+    A "@pool-name" line in a wrong answers section adds every answer of the
+    named pool, except the state's own correct answer. Pools are declared in
+    the file itself or in included library files (see parse_pool_library),
+    and are resolved once; states using the same pools share one read-only
+    tuple of answers.
+
+    A next state may carry a positive relative weight in brackets, such as
+    [3] or [0.5]; unweighted entries of a state that has any weights count
+    as 1. States without weights choose their next state uniformly.
+    Brackets holding anything but a number are part of a protocol name.
+
+    Args:
+        filepath: The protocol file to parse
+        pool_cache: Parsed library files, shared across calls so each
+            library is only parsed once
     """
-    content = filepath.read_text()
-    lines = content.strip().split("\n")
+    if pool_cache is None:
+        pool_cache = {}
+
+    data = filepath.read_bytes()
+    # Hashes exactly what is parsed, plus the fingerprints of included
+    # libraries
+    digest = hashlib.sha256(data)
+    lines = data.decode().strip().split("\n")
 
     # Parse protocol name (first line before ===)
     protocol_name = lines[0].strip()
@@ -38,11 +156,18 @@ def parse_protocol_file(filepath: Path) -> Protocol:
     current_correct: str | None = None
     current_wrong: list[str] = []
     current_next: list[int | str] = []
+    current_weights: list[float | None] = []
+    current_refs: list[str] = []
     section: str | None = None
 
+    pools: dict[str, list[str] | tuple[str, ...]] = {}
+    current_pool: list[str] = []
+    # State id -> pool names referenced by its wrong answers
+    state_refs: dict[int, list[str]] = {}
+
     def save_current_state():
         nonlocal current_state_id, current_description, current_correct
-        nonlocal current_wrong, current_next
+        nonlocal current_wrong, current_next, current_weights, current_refs
 
         if current_state_id is None:
             return
@@ -62,7 +187,14 @@ def parse_protocol_file(filepath: Path) -> Protocol:
             correct_answer=current_correct,
             wrong_answers=current_wrong,
             next_state_ids=current_next,
+            next_state_weights=(
+                [1.0 if weight is None else weight for weight in current_weights]
+                if any(weight is not None for weight in current_weights)
+                else None
+            ),
         )
+        if current_refs:
+            state_refs[current_state_id] = current_refs
 
         # Reset for next state
         current_state_id = None
@@ -70,6 +202,8 @@ def parse_protocol_file(filepath: Path) -> Protocol:
         current_correct = None
         current_wrong = []
         current_next = []
+        current_weights = []
+        current_refs = []
 
     while line_idx < len(lines):
         line = lines[line_idx].rstrip()
@@ -94,7 +228,17 @@ def parse_protocol_file(filepath: Path) -> Protocol:
                 pass  # Not a state definition
 
         # Check for section headers
-        if line.startswith("# Correct answer"):
+        if line.startswith(INCLUDE_HEADER):
+            included, fingerprint = _parse_include(line, filepath.parent, pool_cache)
+            pools.update(included)
+            digest.update(fingerprint.encode())
+            section = None
+            continue
+        elif line.startswith(POOL_HEADER):
+            current_pool = pools[line[len(POOL_HEADER) :].strip()] = []
+            section = "pool"
+            continue
+        elif line.startswith("# Correct answer"):
             section = "correct"
             continue
         elif line.startswith("# Wrong answer"):
@@ -119,8 +263,23 @@ def parse_protocol_file(filepath: Path) -> Protocol:
             current_correct = content_text
             section = None
         elif section == "wrong":
-            current_wrong.append(content_text)
+            if content_text.startswith(POOL_REFERENCE_PREFIX):
+                current_refs.append(content_text[len(POOL_REFERENCE_PREFIX) :])
+            else:
+                current_wrong.append(content_text)
+        elif section == "pool":
+            current_pool.append(content_text)
         elif section == "next":
+            weight = None
+            match = _TRANSITION_WEIGHT.match(content_text)
+            if match:
+                content_text, weight_text = match.groups()
+                weight = float(weight_text)
+                if not 0 < weight < float("inf"):
+                    raise ValueError(
+                        f"{filepath}: invalid transition weight {line.strip()!r}"
+                    )
+            current_weights.append(weight)
             # Try to parse as int (state ID) or keep as string (protocol name)
             try:
                 current_next.append(int(content_text))
@@ -130,7 +289,60 @@ def parse_protocol_file(filepath: Path) -> Protocol:
     # Save the last state
     save_current_state()
 
-    return Protocol(name=protocol_name, states=states)
+    _resolve_pool_references(
+        filepath,
+        states,
+        state_refs,
+        {name: tuple(answers) for name, answers in pools.items()},
+    )
+
+    return Protocol(
+        name=protocol_name, states=states, fingerprint=digest.hexdigest()[:16]
+    )
+
+
+def _resolve_pool_references(
+    filepath: Path,
+    states: dict[int, State],
+    state_refs: dict[int, list[str]],
+    pools: dict[str, tuple[str, ...]],
+):
+    """Expand pool references into each state's wrong answers, replacing
+    the affected entries of states.
+
+    States whose wrong answers come only from pools share one tuple per
+    distinct combination of pools (and correct answer to exclude); tuples,
+    so no state can change the answers of the others or of the pool.
+    """
+    resolved: dict[tuple[tuple[str, ...], str | None], tuple[str, ...]] = {}
+
+    for state_id, refs in state_refs.items():
+        state = states[state_id]
+        key = (tuple(refs), state.correct_answer)
+
+        if key not in resolved:
+            answers: list[str] = []
+            for name in refs:
+                if name not in pools:
+                    raise ValueError(f"{filepath}: unknown answer pool {name!r}")
+                answers.extend(pools[name])
+            if len(refs) == 1 and state.correct_answer not in answers:
+                # Share the pool itself
+                resolved[key] = pools[refs[0]]
+            else:
+                resolved[key] = tuple(
+                    dict.fromkeys(a for a in answers if a != state.correct_answer)
+                )
+
+        if state.wrong_answers:
+            inline = set(state.wrong_answers)
+            wrong_answers = state.wrong_answers + tuple(
+                answer for answer in resolved[key] if answer not in inline
+            )
+        else:
+            wrong_answers = resolved[key]
+        # States are immutable; the alias table carries over unchanged
+        states[state_id] = replace(state, wrong_answers=wrong_answers)
 
 
 def load_protocols_from_directory(directory: Path) -> dict[str, Protocol]:
@@ -140,8 +352,12 @@ def load_protocols_from_directory(directory: Path) -> dict[str, Protocol]:
     if not directory.exists():
         return protocols
 
+    # Shared by every file so each pool library is parsed once
+    pool_cache: PoolCache = {}
     for filepath in directory.glob("*.md"):
-        protocol = parse_protocol_file(filepath)
+        if filepath.name.endswith(POOL_LIBRARY_SUFFIX):
+            continue
+        protocol = parse_protocol_file(filepath, pool_cache)
         protocols[protocol.name] = protocol
 
     return protocols
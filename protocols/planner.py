@@ -0,0 +1,259 @@
+"""Coverage-guided session planning.
+
+Plans a small set of forced paths through a protocol's state graph,
+following cross-protocol jumps, that together visit every reachable state
+and take every transition. Each path can be played by passing its choices
+to GameplayController.start_game.
+
+Run with python -m protocols.planner "Protocol Name".
+"""
+
+import argparse
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .models import Protocol, StateType
+from .parser import DEFAULT_DATA_DIR, load_protocols_from_directory
+
+# A state in the library: (protocol name, state id)
+Node = tuple[str, int]
+# A transition: (from node, next state id as written in the protocol)
+Edge = tuple[Node, int | str]
+
+
+@dataclass
+class PlannedPath:
+    """A forced path through the protocol graph."""
+
+    protocol_name: str
+    choices: list[int | str] = field(default_factory=list)
+    states: list[Node] = field(default_factory=list)
+
+
+class ProtocolGraph:
+    """The state graph of a protocol library, with memoized path queries."""
+
+    def __init__(self, protocols: dict[str, Protocol]):
+        self.protocols = protocols
+        self._prefix: dict[Node, dict[Node, tuple[Node, int | str] | None]] = {}
+        self._suffix: dict[Node, tuple[int | str, Node | None] | None] | None = None
+
+    def initial_node(self, protocol_name: str) -> Node | None:
+        """The node a protocol starts at, if it has an initial state."""
+        protocol = self.protocols.get(protocol_name)
+        if protocol is None or protocol.get_initial_state() is None:
+            return None
+        return (protocol_name, 0)
+
+    def target(self, node: Node, next_id: int | str) -> Node | None:
+        """The node a transition leads to, or None if it ends the game."""
+        if isinstance(next_id, str):
+            target = self.initial_node(next_id)
+        else:
+            target = (node[0], next_id)
+            if self.protocols[node[0]].get_state(next_id) is None:
+                target = None
+        return target
+
+    def _is_final(self, node: Node) -> bool:
+        state = self.protocols[node[0]].get_state(node[1])
+        return state is None or state.state_type == StateType.FINAL
+
+    def transitions(self, node: Node) -> list[int | str]:
+        """The distinct next-state ids of a node, in file order."""
+        if self._is_final(node):
+            return []
+        state = self.protocols[node[0]].get_state(node[1])
+        return list(dict.fromkeys(state.next_state_ids)) if state else []
+
+    def reachable(self, start: Node) -> dict[Node, tuple[Node, int | str] | None]:
+        """Shortest-path tree from start (BFS), memoized per start node.
+
+        Maps every node reachable from start to the step leading to it.
+        """
+        if start not in self._prefix:
+            parents: dict[Node, tuple[Node, int | str] | None] = {start: None}
+            queue = deque([start])
+            while queue:
+                node = queue.popleft()
+                for next_id in self.transitions(node):
+                    target = self.target(node, next_id)
+                    if target is not None and target not in parents:
+                        parents[target] = (node, next_id)
+                        queue.append(target)
+            self._prefix[start] = parents
+        return self._prefix[start]
+
+    def _exits(self) -> dict[Node, tuple[int | str, Node | None] | None]:
+        """For every node, the first step of a shortest path to a game end.
+
+        Computed once for the whole library by dynamic programming backwards
+        from the nodes where the game ends, which handles cycles: nodes
+        inside a cycle with no way out are simply absent.
+        """
+        if self._suffix is not None:
+            return self._suffix
+
+        incoming: dict[Node, list[tuple[Node, int | str]]] = {}
+        exits: dict[Node, tuple[int | str, Node | None] | None] = {}
+        queue: deque[Node] = deque()
+
+        nodes = [
+            (name, state_id)
+            for name, protocol in self.protocols.items()
+            for state_id in protocol.states
+        ]
+        for node in nodes:
+            transitions = self.transitions(node)
+            if not transitions:
+                exits[node] = None
+                queue.append(node)
+            for next_id in transitions:
+                target = self.target(node, next_id)
+                if target is None:
+                    # This transition ends the game directly
+                    if node not in exits:
+                        exits[node] = (next_id, None)
+                        queue.append(node)
+                else:
+                    incoming.setdefault(target, []).append((node, next_id))
+
+        while queue:
+            node = queue.popleft()
+            for source, next_id in incoming.get(node, []):
+                if source not in exits:
+                    exits[source] = (next_id, node)
+                    queue.append(source)
+
+        self._suffix = exits
+        return exits
+
+    def path_to(self, start: Node, node: Node) -> list[tuple[Node, int | str]] | None:
+        """Shortest list of (node, choice) steps from start to node."""
+        parents = self.reachable(start)
+        if node not in parents:
+            return None
+        steps = []
+        while parents[node] is not None:
+            node, next_id = parents[node]
+            steps.append((node, next_id))
+        steps.reverse()
+        return steps
+
+    def path_to_end(self, node: Node | None) -> list[tuple[Node, int | str]] | None:
+        """Shortest list of (node, choice) steps from node to a game end."""
+        exits = self._exits()
+        steps = []
+        while node is not None:
+            if node not in exits:
+                return None
+            step = exits[node]
+            if step is None:
+                break
+            next_id, target = step
+            steps.append((node, next_id))
+            node = target
+        return steps
+
+
+def _to_planned_path(
+    graph: ProtocolGraph, protocol_name: str, steps: list[tuple[Node, int | str]]
+) -> PlannedPath:
+    """Turn a list of steps from the initial state into a PlannedPath."""
+    start = graph.initial_node(protocol_name)
+    path = PlannedPath(protocol_name=protocol_name, states=[start])
+    for node, next_id in steps:
+        path.choices.append(next_id)
+        target = graph.target(node, next_id)
+        if target is not None:
+            path.states.append(target)
+    return path
+
+
+def plan_coverage(
+    protocols: dict[str, Protocol], protocol_name: str
+) -> list[PlannedPath]:
+    """Plan forced paths covering every reachable state and transition.
+
+    For each transition, the candidate path is the shortest way to reach it
+    followed by the shortest way from it to a game end. A greedy set cover
+    over the candidates then picks paths covering the most uncovered states
+    and transitions until everything is covered, which is within a
+    logarithmic factor of the minimum number of paths.
+
+    Transitions from which the game can never end (a cycle with no exit)
+    cannot be part of a finished session and are left out.
+
+    Args:
+        protocols: Dictionary mapping protocol names to Protocol objects
+        protocol_name: The protocol sessions start in
+
+    Returns:
+        The planned paths, in the order they were chosen
+    """
+    graph = ProtocolGraph(protocols)
+    start = graph.initial_node(protocol_name)
+    if start is None:
+        raise ValueError(f"Unknown protocol: {protocol_name}")
+
+    candidates: list[tuple[list[tuple[Node, int | str]], set]] = []
+    for node in graph.reachable(start):
+        prefix = graph.path_to(start, node)
+        for next_id in graph.transitions(node):
+            suffix = graph.path_to_end(graph.target(node, next_id))
+            if suffix is None:
+                continue
+            steps = prefix + [(node, next_id)] + suffix
+            covered: set[Node | Edge] = {start}
+            for step_node, step_id in steps:
+                covered.add((step_node, step_id))
+                target = graph.target(step_node, step_id)
+                if target is not None:
+                    covered.add(target)
+            candidates.append((steps, covered))
+
+    if not candidates:
+        # Nothing to choose, e.g. the protocol starts at a FINAL state
+        return [_to_planned_path(graph, protocol_name, [])]
+
+    uncovered: set[Node | Edge] = set().union(*(c for _, c in candidates))
+    plan: list[PlannedPath] = []
+
+    # Lazy greedy: gains only shrink, so a candidate whose recomputed gain
+    # still tops the heap is the best choice without rescoring the rest
+    heap = [(-len(covered), i) for i, (_, covered) in enumerate(candidates)]
+    heapq.heapify(heap)
+    while uncovered and heap:
+        _, i = heapq.heappop(heap)
+        steps, covered = candidates[i]
+        gain = len(covered & uncovered)
+        if gain == 0:
+            continue
+        if heap and gain < -heap[0][0]:
+            heapq.heappush(heap, (-gain, i))
+            continue
+        uncovered -= covered
+        plan.append(_to_planned_path(graph, protocol_name, steps))
+
+    return plan
+
+
+def main():
+    """Print a coverage plan for a protocol."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("protocol")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    args = parser.parse_args()
+
+    protocols = load_protocols_from_directory(args.data_dir)
+    plan = plan_coverage(protocols, args.protocol)
+    for i, path in enumerate(plan, 1):
+        states = " -> ".join(f"{name}:{state_id}" for name, state_id in path.states)
+        print(f"{i}. {states}")
+    print(f"{len(plan)} sessions cover every state and transition")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Profiling of real sessions.
+
+Runs a function under cProfile and, at the same time, a sampling profiler
+of the main thread. On exit it writes:
+
+    PREFIX.pstats          cProfile statistics (load with pstats or snakeviz)
+    PREFIX.collapsed       sampled stacks in collapsed format, one
+                           "frame;frame;... count" per line, for
+                           flamegraph.pl or speedscope
+    PREFIX.subsystems.txt  time per subsystem (parser, gameplay, screens, ...)
+
+Stacks in the collapsed output are rooted at the subsystem of the innermost
+protocols frame, so the flamegraph's first level splits the time by
+subsystem.
+"""
+
+import cProfile
+import io
+import pstats
+import random
+import sys
+import threading
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from types import FrameType
+
+from .gameplay import GameplayController, play_session
+from .models import Protocol
+
+_PACKAGE_DIR = Path(__file__).parent
+
+# Top-level module or subpackage -> subsystem; other package modules are "app"
+SUBSYSTEMS = {
+    "parser": "parser",
+    "gameplay": "gameplay",
+    "models": "gameplay",
+    "screens": "screens",
+    "base": "screens",
+}
+
+
+def subsystem_of(filename: str) -> str:
+    """Subsystem a source file belongs to."""
+    path = Path(filename)
+    if path.is_relative_to(_PACKAGE_DIR):
+        parts = path.relative_to(_PACKAGE_DIR).with_suffix("").parts
+        return SUBSYSTEMS.get(parts[0], "app")
+    if "tkinter" in path.parts:
+        return "tk"
+    return "other"
+
+
+def _frame_label(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+class StackSampler:
+    """Samples a thread's stack at a fixed interval from a background thread."""
+
+    def __init__(self, interval: float = 0.001, thread_id: int | None = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        """Start sampling."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame: FrameType) -> str:
+        """Collapse a stack to "subsystem;outer;...;inner"."""
+        labels = []
+        subsystem = None
+        current: FrameType | None = frame
+        while current is not None:
+            labels.append(_frame_label(current))
+            filename = current.f_code.co_filename
+            if subsystem is None and Path(filename).is_relative_to(_PACKAGE_DIR):
+                subsystem = subsystem_of(filename)
+            current = current.f_back
+        labels.append(subsystem or "other")
+        labels.reverse()
+        return ";".join(labels)
+
+    def write_collapsed(self, path: Path):
+        """Write the samples in collapsed-stack format."""
+        with path.open("w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def summarize_subsystems(stats: pstats.Stats, stacks: Counter[str]) -> str:
+    """Time per subsystem.
+
+    "sampled" is the share of stack samples, which counts time spent in the
+    standard library and builtins towards the subsystem that called them.
+    "own time" and "calls" come from cProfile and count only the
+    subsystem's own functions; library code is listed separately as "other".
+    """
+    own_time: Counter[str] = Counter()
+    calls: Counter[str] = Counter()
+    for (filename, _line, _name), (_cc, ncalls, tottime, _ct, _callers) in (
+        stats.stats.items()
+    ):
+        subsystem = subsystem_of(filename)
+        own_time[subsystem] += tottime
+        calls[subsystem] += ncalls
+
+    sampled: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        sampled[stack.partition(";")[0]] += count
+    total_samples = sum(sampled.values()) or 1
+
+    lines = [f"{'subsystem':<12} {'sampled':>8} {'own time':>10} {'calls':>10}"]
+    for subsystem in sorted(
+        own_time.keys() | sampled.keys(),
+        key=lambda name: (-sampled[name], -own_time[name]),
+    ):
+        lines.append(
+            f"{subsystem:<12} {sampled[subsystem] / total_samples:>8.1%} "
+            f"{own_time[subsystem]:>9.3f}s {calls[subsystem]:>10}"
+        )
+    return "\n".join(lines)
+
+
+def run_profiled(func: Callable[[], None], output_prefix: Path):
+    """Run func under cProfile and the stack sampler and write the reports.
+
+    Reports are written even if func raises or is interrupted.
+    """
+    output_prefix.parent.mkdir(parents=True, exist_ok=True)
+    profiler = cProfile.Profile()
+    sampler = StackSampler()
+
+    sampler.start()
+    profiler.enable()
+    try:
+        func()
+    finally:
+        profiler.disable()
+        sampler.stop()
+
+        profiler.dump_stats(f"{output_prefix}.pstats")
+        sampler.write_collapsed(Path(f"{output_prefix}.collapsed"))
+
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        summary = summarize_subsystems(stats, sampler.stacks)
+        Path(f"{output_prefix}.subsystems.txt").write_text(summary + "\n")
+        print(summary)
+        print(f"Profile written to {output_prefix}.*")
+
+
+def run_headless_sessions(
+    protocols: dict[str, Protocol],
+    protocol_name: str,
+    sessions: int,
+    seed: int | None = None,
+):
+    """Play sessions through GameplayController with random answers."""
+    rng = random.Random(seed)
+    controller = GameplayController(protocols)
+    for _ in range(sessions):
+        play_session(
+            controller,
+            protocol_name,
+            lambda prepared: rng.choice(prepared.options),
+            seed=rng.getrandbits(63),
+        )
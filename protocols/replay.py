@@ -0,0 +1,311 @@
+"""Deterministic headless replay of recorded practice sessions.
+
+A session is fully determined by its protocol, its seed and the stream of
+answers the trainee gave. Replaying runs that input through a headless
+GameplayController and reports any divergence from the recorded states or
+score. Sessions that visited a protocol whose file has changed since they
+were recorded can't be compared; they are skipped, and fail the run unless
+--allow-library-change is given.
+
+Run with python -m protocols.replay sessions.jsonl.
+"""
+
+import argparse
+import json
+import os
+import time
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .gameplay import GameplayController, PreparedState, play_session
+from .models import Protocol
+from .parser import DEFAULT_DATA_DIR, load_protocols_from_directory
+from .shared import SharedLibrary
+
+
+@dataclass
+class SessionRecord:
+    """The input and observed outcome of one practice session."""
+
+    protocol_name: str
+    seed: int
+    answers: list[str] = field(default_factory=list)
+    states: list[tuple[str, int]] = field(default_factory=list)
+    correct: int = 0
+    total: int = 0
+    plan: list[int | str] | None = None
+    # Protocol.fingerprint of each protocol the session visited, by name
+    library: dict[str, str] | None = None
+
+    @classmethod
+    def from_controller(cls, controller: GameplayController) -> "SessionRecord":
+        """Record the session the controller just played."""
+        if controller.session_seed is None or not controller.visited_states:
+            raise ValueError("No session has been played")
+        library = {}
+        for name in dict.fromkeys(name for name, _ in controller.visited_states):
+            fingerprint = controller.protocols[name].fingerprint
+            if fingerprint is not None:
+                library[name] = fingerprint
+        return cls(
+            protocol_name=controller.visited_states[0][0],
+            seed=controller.session_seed,
+            answers=list(controller.answer_log),
+            states=list(controller.visited_states),
+            correct=controller.correct_answers,
+            total=controller.total_questions,
+            plan=controller.plan,
+            library=library or None,
+        )
+
+    def to_json(self) -> str:
+        """Serialize the record as a single JSON line."""
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, line: str) -> "SessionRecord":
+        """Parse a record written by to_json."""
+        data = json.loads(line)
+        data["states"] = [tuple(state) for state in data["states"]]
+        if not isinstance(data.get("library"), dict):
+            # Whole-directory fingerprints of older records can't be checked
+            # per protocol
+            data["library"] = None
+        return cls(**data)
+
+
+@dataclass
+class ReplayResult:
+    """The outcome of replaying a SessionRecord."""
+
+    record: SessionRecord
+    states: list[tuple[str, int]]
+    correct: int
+    total: int
+    divergence: str | None = None
+    # Visited protocols whose files changed since recording; not replayed
+    changed_protocols: list[str] = field(default_factory=list)
+
+    @property
+    def diverged(self) -> bool:
+        """Whether the replay differs from the recording."""
+        return self.divergence is not None
+
+    @property
+    def library_changed(self) -> bool:
+        """Whether the session was skipped because its protocols changed."""
+        return bool(self.changed_protocols)
+
+
+def _changed_protocols(
+    protocols: Mapping[str, Protocol], record: SessionRecord
+) -> list[str]:
+    """The protocols a recorded session visited that have since changed.
+
+    Only these can make a replay differ; edits to other protocols don't.
+    Protocols without a fingerprint on either side count as unchanged.
+    """
+    changed = []
+    for name, fingerprint in (record.library or {}).items():
+        protocol = protocols.get(name)
+        if protocol is None or protocol.fingerprint not in (None, fingerprint):
+            changed.append(name)
+    return changed
+
+
+def replay_session(
+    protocols: Mapping[str, Protocol], record: SessionRecord
+) -> ReplayResult:
+    """Re-execute a recorded session and compare it with the recording.
+
+    If a protocol the session visited was changed or removed since it was
+    recorded, the session is not replayed and the result lists it in
+    changed_protocols instead of diverging.
+    """
+    changed = _changed_protocols(protocols, record)
+    if changed:
+        return ReplayResult(
+            record=record, states=[], correct=0, total=0, changed_protocols=changed
+        )
+
+    controller = GameplayController(protocols)
+    answers = iter(record.answers)
+
+    def recorded_answer(prepared: PreparedState) -> str:
+        answer = next(answers, None)
+        if answer is None:
+            raise ValueError("answer stream exhausted")
+        if answer not in prepared.options:
+            raise ValueError(
+                f"answer {answer!r} not offered at state "
+                f"{controller.visited_states[-1]}"
+            )
+        return answer
+
+    divergence: str | None = None
+    try:
+        play_session(
+            controller,
+            record.protocol_name,
+            recorded_answer,
+            seed=record.seed,
+            plan=record.plan,
+        )
+    except ValueError as e:
+        divergence = str(e)
+
+    result = ReplayResult(
+        record=record,
+        states=list(controller.visited_states),
+        correct=controller.correct_answers,
+        total=controller.total_questions,
+        divergence=divergence,
+    )
+    if result.divergence is None:
+        result.divergence = _compare(record, result)
+    return result
+
+
+def _compare(record: SessionRecord, result: ReplayResult) -> str | None:
+    """Describe the first difference between a recording and its replay."""
+    for i, (expected, actual) in enumerate(zip(record.states, result.states)):
+        if expected != actual:
+            return f"state {i}: recorded {expected}, replayed {actual}"
+    if len(record.states) != len(result.states):
+        return (
+            f"recorded {len(record.states)} states, "
+            f"replayed {len(result.states)}"
+        )
+    if (record.correct, record.total) != (result.correct, result.total):
+        return (
+            f"recorded score {record.correct}/{record.total}, "
+            f"replayed {result.correct}/{result.total}"
+        )
+    return None
+
+
+# Protocols loaded once per worker process by _init_worker or _attach_worker
+_worker_protocols: dict[str, Protocol] | SharedLibrary = {}
+
+
+def _init_worker(data_dir: Path):
+    """Load the protocol library in a worker process."""
+    global _worker_protocols
+    _worker_protocols = load_protocols_from_directory(data_dir)
+
+
+def _attach_worker(name: str):
+    """Attach a worker process to a library in shared memory."""
+    global _worker_protocols
+    _worker_protocols = SharedLibrary.attach(name)
+
+
+def _replay_in_worker(record: SessionRecord) -> ReplayResult:
+    """Replay a record against the worker's protocol library."""
+    return replay_session(_worker_protocols, record)
+
+
+def replay_sessions(
+    records: Iterable[SessionRecord],
+    data_dir: Path = DEFAULT_DATA_DIR,
+    processes: int | None = None,
+    chunksize: int = 256,
+    share_library: bool = False,
+) -> list[ReplayResult]:
+    """Replay many sessions in parallel across worker processes.
+
+    Args:
+        records: The sessions to replay
+        data_dir: Directory containing protocol markdown files
+        processes: Number of worker processes (CPU count if None); 1 replays
+            in the current process
+        chunksize: Number of sessions sent to a worker at a time
+        share_library: Load the library once into shared memory and have
+            workers attach to it, instead of each worker loading its own copy
+
+    Returns:
+        One ReplayResult per record, in order
+    """
+    if processes == 1:
+        protocols = load_protocols_from_directory(data_dir)
+        return [replay_session(protocols, record) for record in records]
+
+    library = SharedLibrary.from_directory(data_dir) if share_library else None
+    try:
+        with ProcessPoolExecutor(
+            max_workers=processes or os.cpu_count(),
+            initializer=_attach_worker if library else _init_worker,
+            initargs=(library.name if library else data_dir,),
+        ) as executor:
+            return list(
+                executor.map(_replay_in_worker, records, chunksize=chunksize)
+            )
+    finally:
+        if library is not None:
+            library.close()
+            library.unlink()
+
+
+def main():
+    """Replay recorded sessions and report divergences."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sessions", type=Path, help="JSON lines session log")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument(
+        "--share-library",
+        action="store_true",
+        help="load the library once into shared memory for all workers",
+    )
+    parser.add_argument(
+        "--allow-library-change",
+        action="store_true",
+        help="exit successfully even if sessions were skipped because "
+        "protocols they visited changed since recording",
+    )
+    args = parser.parse_args()
+
+    records = [
+        SessionRecord.from_json(line)
+        for line in args.sessions.read_text().splitlines()
+        if line.strip()
+    ]
+
+    start = time.perf_counter()
+    results = replay_sessions(
+        records,
+        args.data_dir,
+        args.processes,
+        share_library=args.share_library,
+    )
+    elapsed = time.perf_counter() - start
+
+    diverged = [result for result in results if result.diverged]
+    for result in diverged:
+        print(
+            f"DIVERGED {result.record.protocol_name} seed={result.record.seed}: "
+            f"{result.divergence}"
+        )
+    changed = [result for result in results if result.library_changed]
+    for result in changed:
+        print(
+            f"DIFFERENT LIBRARY {result.record.protocol_name} "
+            f"seed={result.record.seed}: changed since recording: "
+            f"{', '.join(result.changed_protocols)}"
+        )
+
+    rate = len(results) / elapsed if elapsed else float("inf")
+    print(
+        f"Replayed {len(results)} sessions in {elapsed:.2f}s "
+        f"({rate:.0f}/s), {len(diverged)} diverged, "
+        f"{len(changed)} skipped because their protocols changed"
+    )
+    # Skipped sessions weren't checked, so they fail the run unless allowed
+    failed = diverged or (changed and not args.allow_library_change)
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Accuracy trend chart drawn on a tkinter canvas."""
+
+import tkinter as tk
+
+from ..downsample import lttb
+from ..history import AccuracySeries
+
+
+class TrendChart:
+    """Line chart of a trainee's rolling accuracy.
+
+    The series is downsampled to the canvas width, and the projected canvas
+    coordinates are cached per trainee until the series changes, so drawing
+    costs the same for ten answers as for a million.
+    """
+
+    PADDING = 6
+
+    def __init__(
+        self,
+        parent: tk.Widget,
+        width: int = 500,
+        height: int = 120,
+        bg: str = "#ecf0f1",
+        line_color: str = "#3498db",
+        grid_color: str = "#bdc3c7",
+    ):
+        self.width = width
+        self.height = height
+        self.line_color = line_color
+        self.canvas = tk.Canvas(
+            parent, width=width, height=height, bg=bg, highlightthickness=0
+        )
+
+        # Gridlines at 0%, 50% and 100%
+        for fraction in (0.0, 0.5, 1.0):
+            y = self._y(fraction)
+            self.canvas.create_line(
+                self.PADDING, y, width - self.PADDING, y, fill=grid_color, dash=(2, 4)
+            )
+
+        self._line: int | None = None
+        # Trainee -> (series version, canvas coordinates)
+        self._cache: dict[str, tuple[int, list[float]]] = {}
+
+    def _y(self, accuracy: float) -> float:
+        """Canvas y coordinate of an accuracy between 0 and 1."""
+        return self.PADDING + (1 - accuracy) * (self.height - 2 * self.PADDING)
+
+    def _project(self, series: AccuracySeries) -> list[float]:
+        """Downsample the series to the canvas width and project it."""
+        points = lttb(series.buckets.points(), self.width - 2 * self.PADDING)
+        span = max(len(series) - 1, 1)
+        usable_width = self.width - 2 * self.PADDING
+
+        coords: list[float] = []
+        for x, accuracy in points:
+            coords.append(self.PADDING + x / span * usable_width)
+            coords.append(self._y(accuracy))
+        return coords
+
+    def draw(self, trainee: str, series: AccuracySeries):
+        """Draw a trainee's series, reprojecting it only if it changed."""
+        cached = self._cache.get(trainee)
+        if cached is None or cached[0] != series.version:
+            cached = (series.version, self._project(series))
+            self._cache[trainee] = cached
+        coords = cached[1]
+
+        if len(coords) < 4:
+            # A line needs at least two points
+            if self._line is not None:
+                self.canvas.delete(self._line)
+                self._line = None
+            return
+
+        if self._line is None:
+            self._line = self.canvas.create_line(
+                *coords, fill=self.line_color, width=2
+            )
+        else:
+            self.canvas.coords(self._line, *coords)
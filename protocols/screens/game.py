@@ -4,11 +4,23 @@ import tkinter as tk
 from collections.abc import Callable
 
 from ..base import BaseScreen
+from ..gameplay import PreparedState, prepare_state
 from ..models import State, StateType
 
 
 class GameScreen(BaseScreen):
-    """Screen for playing the protocol practice game."""
+    """Screen for playing the protocol practice game.
+
+    The content is laid out with grid. Widgets that come and go are hidden
+    with grid_remove, which keeps their grid options, and shown again with a
+    bare grid() call, and only when their visibility actually changes.
+    """
+
+    # Grid rows of the content frame
+    CARD_ROW = 0
+    BUTTONS_ROW = 1
+    FEEDBACK_ROW = 2
+    CONTINUE_ROW = 3
 
     def __init__(
         self,
@@ -23,16 +35,30 @@ class GameScreen(BaseScreen):
         self.answer_buttons: list[tk.Button] = []
         self.current_options: list[str] = []
         self.answered = False
+        # What is currently shown; changed only through the _set_* methods
+        self._buttons_visible = True
+        self._feedback_visible = False
+        self._continue_visible = False
+        self._continue_pady = 10
         super().__init__(root)
 
     def _setup_ui(self):
         """Set up the game UI."""
-        # Header with back button
-        self._create_header("Protocol Practice", self.on_back)
+        # Header with back button and live score
+        header = self._create_header("Protocol Practice", self.on_back)
+        self.score_label = tk.Label(
+            header,
+            text="",
+            font=("Helvetica", 12),
+            bg=self.BG_COLOR,
+            fg=self.TEXT_COLOR,
+        )
+        self.score_label.pack(side=tk.RIGHT)
 
         # Main content area
         self.content_frame = tk.Frame(self.frame, bg=self.BG_COLOR)
         self.content_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=20)
+        self.content_frame.columnconfigure(0, weight=1)
 
         # Scenario card
         self.card_frame = tk.Frame(
@@ -41,7 +67,7 @@ class GameScreen(BaseScreen):
             padx=30,
             pady=25,
         )
-        self.card_frame.pack(fill=tk.X, pady=(0, 20))
+        self.card_frame.grid(row=self.CARD_ROW, sticky=tk.EW, pady=(0, 20))
 
         self.scenario_label = tk.Label(
             self.card_frame,
@@ -56,7 +82,7 @@ class GameScreen(BaseScreen):
 
         # Answer buttons frame
         self.buttons_frame = tk.Frame(self.content_frame, bg=self.BG_COLOR)
-        self.buttons_frame.pack(fill=tk.X, pady=10)
+        self.buttons_frame.grid(row=self.BUTTONS_ROW, sticky=tk.EW, pady=10)
 
         # Create 4 answer buttons
         for i in range(4):
@@ -80,18 +106,9 @@ class GameScreen(BaseScreen):
             btn.config(command=lambda idx=i: self._on_answer_clicked(idx))
             self.answer_buttons.append(btn)
 
-        # Feedback frame (initially hidden)
-        self.feedback_frame = tk.Frame(self.content_frame, bg=self.BG_COLOR)
-
-        self.feedback_label = tk.Label(
-            self.feedback_frame,
-            text="",
-            font=("Helvetica", 14, "bold"),
-            fg="white",
-            padx=20,
-            pady=15,
-        )
-        self.feedback_label.pack(fill=tk.X)
+        # Feedback frame, built on the first answer
+        self.feedback_frame: tk.Frame | None = None
+        self.feedback_label: tk.Label | None = None
 
         # Continue button (shown after answering or for INTRO states)
         self.continue_btn = tk.Button(
@@ -108,6 +125,8 @@ class GameScreen(BaseScreen):
             cursor="hand2",
             relief=tk.FLAT,
         )
+        self.continue_btn.grid(row=self.CONTINUE_ROW, pady=self._continue_pady)
+        self.continue_btn.grid_remove()
 
         # Keyboard bindings
         self.frame.bind("1", lambda e: self._on_key_answer(0))
@@ -117,42 +136,77 @@ class GameScreen(BaseScreen):
         self.frame.bind("<Return>", lambda e: self._on_key_continue())
         self.frame.bind("<space>", lambda e: self._on_key_continue())
 
-    def display_state(self, state: State):
-        """Display a state on the screen."""
+    def display_state(self, state: State, prepared: PreparedState | None = None):
+        """Display a state on the screen.
+
+        Args:
+            state: The state to display
+            prepared: Options and labels prepared ahead of time; sampled here
+                if not given
+        """
+        if prepared is None or prepared.state is not state:
+            prepared = prepare_state(state)
+
         self.answered = False
         self.scenario_label.config(text=state.description)
-
-        # Hide feedback
-        self.feedback_frame.pack_forget()
-        self.continue_btn.pack_forget()
+        self._set_feedback_visible(False)
 
         if state.state_type == StateType.QUESTION:
             # Show answer buttons with shuffled options
-            self.current_options = state.get_shuffled_options()
-            self._show_answer_buttons()
-            for i, option in enumerate(self.current_options):
-                self.answer_buttons[i].config(
-                    text=f"{i + 1}. {option}",
+            self.current_options = prepared.options
+            self._set_buttons_visible(True)
+            for button, label in zip(self.answer_buttons, prepared.labels):
+                button.config(
+                    text=label,
                     state=tk.NORMAL,
                     bg=self.CARD_COLOR,
                     fg=self.DARK_TEXT,
                 )
+            self._set_continue(None)
         elif state.state_type == StateType.INTRO:
             # Hide answer buttons, show Next button
-            self._hide_answer_buttons()
-            self.continue_btn.config(text="Next")
-            self.continue_btn.pack(pady=20)
+            self._set_buttons_visible(False)
+            self._set_continue("Next", pady=20)
         else:
             # FINAL state - shouldn't normally display here
-            self._hide_answer_buttons()
+            self._set_buttons_visible(False)
+            self._set_continue(None)
 
-    def _show_answer_buttons(self):
-        """Show all answer buttons."""
-        self.buttons_frame.pack(fill=tk.X, pady=10)
+    def _set_buttons_visible(self, visible: bool):
+        """Show or hide the answer buttons if that changes anything."""
+        if visible == self._buttons_visible:
+            return
+        if visible:
+            self.buttons_frame.grid()
+        else:
+            self.buttons_frame.grid_remove()
+        self._buttons_visible = visible
 
-    def _hide_answer_buttons(self):
-        """Hide all answer buttons."""
-        self.buttons_frame.pack_forget()
+    def _set_feedback_visible(self, visible: bool):
+        """Show or hide the feedback if that changes anything."""
+        if visible == self._feedback_visible:
+            return
+        if visible:
+            self.feedback_frame.grid()
+        else:
+            self.feedback_frame.grid_remove()
+        self._feedback_visible = visible
+
+    def _set_continue(self, text: str | None, pady: int = 10):
+        """Show the Continue button with the given text, or hide it if None."""
+        if text is None:
+            if self._continue_visible:
+                self.continue_btn.grid_remove()
+                self._continue_visible = False
+            return
+
+        self.continue_btn.config(text=text)
+        if pady != self._continue_pady:
+            self.continue_btn.grid_configure(pady=pady)
+            self._continue_pady = pady
+        if not self._continue_visible:
+            self.continue_btn.grid()
+            self._continue_visible = True
 
     def _on_answer_clicked(self, index: int):
         """Handle answer button click."""
@@ -169,8 +223,27 @@ class GameScreen(BaseScreen):
         # The callback will tell us if it was correct and show feedback
         self.on_answer_callback(selected, True)  # True indicates user made selection
 
+    def _create_feedback(self):
+        """Create the feedback frame (initially hidden)."""
+        self.feedback_frame = tk.Frame(self.content_frame, bg=self.BG_COLOR)
+        self.feedback_frame.grid(row=self.FEEDBACK_ROW, sticky=tk.EW, pady=15)
+        self.feedback_frame.grid_remove()
+
+        self.feedback_label = tk.Label(
+            self.feedback_frame,
+            text="",
+            font=("Helvetica", 14, "bold"),
+            fg="white",
+            padx=20,
+            pady=15,
+        )
+        self.feedback_label.pack(fill=tk.X)
+
     def show_feedback(self, is_correct: bool, correct_answer: str):
         """Show feedback after answering."""
+        if self.feedback_frame is None:
+            self._create_feedback()
+
         if is_correct:
             self.feedback_label.config(
                 text="Correct!",
@@ -186,14 +259,17 @@ class GameScreen(BaseScreen):
         for i, option in enumerate(self.current_options):
             if option == correct_answer:
                 self.answer_buttons[i].config(bg=self.SUCCESS_COLOR, fg="white")
-            elif self.answer_buttons[i]["state"] == tk.DISABLED and not is_correct:
-                # This was the selected wrong answer
-                if self.answer_buttons[i]["bg"] != self.SUCCESS_COLOR:
-                    self.answer_buttons[i].config(bg=self.ERROR_COLOR, fg="white")
+            elif not is_correct:
+                # Every option is disabled once answered, so after a wrong
+                # answer all the wrong options are marked
+                self.answer_buttons[i].config(bg=self.ERROR_COLOR, fg="white")
+
+        self._set_feedback_visible(True)
+        self._set_continue("Continue")
 
-        self.feedback_frame.pack(fill=tk.X, pady=15)
-        self.continue_btn.config(text="Continue")
-        self.continue_btn.pack(pady=10)
+    def display_score(self, correct: int, total: int):
+        """Show the running score in the header."""
+        self.score_label.config(text=f"{correct}/{total}" if total else "")
 
     def _on_continue_clicked(self):
         """Handle continue button click."""
@@ -203,14 +279,14 @@ class GameScreen(BaseScreen):
         """Handle number key press for answer selection."""
         if (
             not self.answered
-            and self.buttons_frame.winfo_ismapped()
+            and self._buttons_visible
             and index < len(self.current_options)
         ):
             self._on_answer_clicked(index)
 
     def _on_key_continue(self):
         """Handle Enter/Space key for continue."""
-        if self.continue_btn.winfo_ismapped():
+        if self._continue_visible:
             self._on_continue_clicked()
 
     def show(self):
@@ -4,6 +4,8 @@ import tkinter as tk
 from collections.abc import Callable
 
 from ..base import BaseScreen
+from ..history import AccuracySeries
+from .chart import TrendChart
 
 
 class ResultsScreen(BaseScreen):
@@ -29,7 +31,7 @@ class ResultsScreen(BaseScreen):
             bg=self.BG_COLOR,
             fg=self.TEXT_COLOR,
         )
-        self.title_label.pack(pady=(60, 20))
+        self.title_label.pack(pady=(30, 10))
 
         # Final state description
         self.description_label = tk.Label(
@@ -40,11 +42,11 @@ class ResultsScreen(BaseScreen):
             fg=self.TEXT_COLOR,
             wraplength=500,
         )
-        self.description_label.pack(pady=(0, 30))
+        self.description_label.pack(pady=(0, 15))
 
         # Score card
         self.score_frame = tk.Frame(self.frame, bg=self.CARD_COLOR, padx=40, pady=30)
-        self.score_frame.pack(pady=20)
+        self.score_frame.pack(pady=10)
 
         self.score_label = tk.Label(
             self.score_frame,
@@ -64,9 +66,13 @@ class ResultsScreen(BaseScreen):
         )
         self.message_label.pack(pady=(10, 0))
 
+        # Accuracy trend, built once there is history to show
+        self.trend_label: tk.Label | None = None
+        self.trend_chart: TrendChart | None = None
+
         # Buttons frame
         buttons_frame = tk.Frame(self.frame, bg=self.BG_COLOR)
-        buttons_frame.pack(pady=40)
+        buttons_frame.pack(side=tk.BOTTOM, pady=30)
 
         play_again_btn = tk.Button(
             buttons_frame,
@@ -129,6 +135,30 @@ class ResultsScreen(BaseScreen):
             self.score_label.config(text="No questions")
             self.message_label.config(text="This protocol had no questions.")
 
+    def display_trend(self, trainee: str, series: AccuracySeries):
+        """Display a trainee's accuracy history below the score."""
+        if len(series) < 2:
+            if self.trend_chart is not None:
+                self.trend_label.pack_forget()
+                self.trend_chart.canvas.pack_forget()
+            return
+
+        if self.trend_chart is None:
+            self.trend_label = tk.Label(
+                self.frame,
+                font=("Helvetica", 12),
+                bg=self.BG_COLOR,
+                fg=self.TEXT_COLOR,
+            )
+            self.trend_chart = TrendChart(
+                self.frame, width=500, height=100, bg=self.CARD_COLOR
+            )
+
+        self.trend_label.config(text=f"Accuracy trend ({len(series)} answers)")
+        self.trend_label.pack(pady=(15, 5))
+        self.trend_chart.canvas.pack()
+        self.trend_chart.draw(trainee, series)
+
     def show(self):
         """Show the screen and enable keyboard focus."""
         super().show()
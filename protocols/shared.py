@@ -0,0 +1,412 @@
+"""Protocol library shared between processes through shared memory.
+
+One process loads the library and serializes it into a single
+multiprocessing.shared_memory block. Other processes attach to the block by
+name and read it in place: protocols and states are looked up directly in
+the shared buffer and only the states actually requested are turned into
+State objects, kept in a bounded per-process cache, so each worker's
+private memory stays nearly constant however large the library or however
+many workers there are.
+
+Layout (little-endian int32 arrays after a fixed header, then float64
+arrays):
+    strings   n_strings + 1 offsets into the UTF-8 string blob
+    protocols (name, first state, state count, fingerprint or -1) per
+              protocol
+    states    (id, type, description, correct answer or -1,
+               wrong start, wrong count, next start, next count) per state,
+              sorted by id within each protocol
+    wrong     string index per wrong answer; states sharing a list (pools)
+              share a range
+    next      (kind, value) per transition; kind 0 is a state id, 1 a
+              protocol name string
+    aliases   alias table column per transition (see AliasTable.tables)
+    weights   weight per transition, NaN for states without weights
+    accept    alias table acceptance probability per transition, so weighted
+              states need no table rebuilding when read
+    blob      UTF-8 bytes of every distinct string
+"""
+
+import math
+import struct
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from multiprocessing import shared_memory
+from pathlib import Path
+
+from .models import AliasTable, Protocol, State, StateType
+from .parser import load_protocols_from_directory
+
+_MAGIC = b"EMSL"
+_VERSION = 4
+_HEADER = struct.Struct("<4s6I")
+_PROTOCOL_FIELDS = 4
+_STATE_FIELDS = 8
+_NEXT_FIELDS = 2
+# Built State objects kept per process, most recently used last
+_STATE_CACHE_SIZE = 1024
+
+
+def serialize_library(protocols: dict[str, Protocol]) -> bytes:
+    """Serialize a protocol library into the shared layout."""
+    strings: dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+
+    protocol_rows: list[int] = []
+    state_rows: list[int] = []
+    wrong: list[int] = []
+    next_rows: list[int] = []
+    aliases: list[int] = []
+    weights: list[float] = []
+    accept: list[float] = []
+    # id() of a wrong answer list -> (start, count), so shared pools stay shared
+    wrong_ranges: dict[int, tuple[int, int]] = {}
+
+    for name, protocol in protocols.items():
+        protocol_rows += [
+            intern(name),
+            len(state_rows) // _STATE_FIELDS,
+            len(protocol.states),
+            -1 if protocol.fingerprint is None else intern(protocol.fingerprint),
+        ]
+        for state_id in sorted(protocol.states):
+            state = protocol.states[state_id]
+
+            key = id(state.wrong_answers)
+            if key not in wrong_ranges:
+                wrong_ranges[key] = (len(wrong), len(state.wrong_answers))
+                wrong.extend(intern(text) for text in state.wrong_answers)
+            wrong_start, wrong_count = wrong_ranges[key]
+
+            next_start = len(next_rows) // _NEXT_FIELDS
+            for next_id in state.next_state_ids:
+                if isinstance(next_id, str):
+                    next_rows += [1, intern(next_id)]
+                else:
+                    next_rows += [0, next_id]
+            if state.transition_table is not None:
+                probabilities, columns = state.transition_table.tables()
+                weights.extend(state.transition_table.weights)
+                accept.extend(probabilities)
+                aliases.extend(columns)
+            else:
+                weights.extend([math.nan] * len(state.next_state_ids))
+                accept.extend([1.0] * len(state.next_state_ids))
+                aliases.extend(range(len(state.next_state_ids)))
+
+            state_rows += [
+                state.id,
+                state.state_type.value,
+                intern(state.description),
+                -1 if state.correct_answer is None else intern(state.correct_answer),
+                wrong_start,
+                wrong_count,
+                next_start,
+                len(state.next_state_ids),
+            ]
+
+    encoded = [text.encode() for text in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        len(protocols),
+        len(strings),
+        len(state_rows) // _STATE_FIELDS,
+        len(wrong),
+        len(next_rows) // _NEXT_FIELDS,
+    )
+    arrays = offsets + protocol_rows + state_rows + wrong + next_rows + aliases
+    floats = weights + accept
+    return (
+        header
+        + struct.pack(f"<{len(arrays)}i", *arrays)
+        + struct.pack(f"<{len(floats)}d", *floats)
+        + b"".join(encoded)
+    )
+
+
+class _StateIds:
+    """Sequence view of the state ids of one protocol, for bisection."""
+
+    def __init__(self, states: memoryview, first: int, count: int):
+        self._states = states
+        self._first = first
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> int:
+        return self._states[(self._first + index) * _STATE_FIELDS]
+
+
+class SharedProtocol(Mapping[int, State]):
+    """Read-only view of a protocol inside a SharedLibrary.
+
+    Offers the same lookups as Protocol; it is also a mapping of state ids
+    to states, standing in for Protocol.states.
+    """
+
+    def __init__(
+        self,
+        library: "SharedLibrary",
+        name: str,
+        first: int,
+        count: int,
+        fingerprint: str | None = None,
+    ):
+        self.name = name
+        self.fingerprint = fingerprint
+        self._library = library
+        self._first = first
+        self._ids = _StateIds(library._states, first, count)
+
+    @property
+    def states(self) -> "SharedProtocol":
+        """The protocol's states, keyed by id."""
+        return self
+
+    def _index(self, state_id: int) -> int | None:
+        i = bisect_left(self._ids, state_id)
+        if i < len(self._ids) and self._ids[i] == state_id:
+            return self._first + i
+        return None
+
+    def get_initial_state(self) -> State | None:
+        """Get the initial state (state with id 0)."""
+        return self.get_state(0)
+
+    def get_state(self, state_id: int) -> State | None:
+        """Get a state by its ID."""
+        index = self._index(state_id)
+        return None if index is None else self._library._state(index)
+
+    def __getitem__(self, state_id: int) -> State:
+        state = self.get_state(state_id)
+        if state is None:
+            raise KeyError(state_id)
+        return state
+
+    def __contains__(self, state_id: object) -> bool:
+        return isinstance(state_id, int) and self._index(state_id) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return (self._ids[i] for i in range(len(self._ids)))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class SharedLibrary(Mapping[str, SharedProtocol]):
+    """A protocol library in shared memory, usable wherever the
+    dict[str, Protocol] from load_protocols_from_directory is.
+
+    Use create (or from_directory) in the loading process, and attach with
+    the block's name in the others. Call close in every process when done,
+    and unlink once in the creating process; used as a context manager,
+    both happen on exit.
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        owner: bool,
+        cache_size: int = _STATE_CACHE_SIZE,
+    ):
+        self.shm = shm
+        self.owner = owner
+        # State row index -> built State; repeated lookups return the same
+        # object without decoding the row again
+        self._state_cache: OrderedDict[int, State] = OrderedDict()
+        self._cache_size = cache_size
+
+        buffer = shm.buf
+        magic, version, n_protocols, n_strings, n_states, n_wrong, n_next = (
+            _HEADER.unpack_from(buffer)
+        )
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{shm.name} does not hold a protocol library")
+
+        ints = buffer[_HEADER.size :].cast("B")
+        end = 4 * (
+            n_strings
+            + 1
+            + n_protocols * _PROTOCOL_FIELDS
+            + n_states * _STATE_FIELDS
+            + n_wrong
+            + n_next * _NEXT_FIELDS
+            + n_next
+        )
+        arrays = ints[:end].cast("i")
+        floats = ints[end : end + 16 * n_next].cast("d")
+        self._weights = floats[:n_next]
+        self._accept = floats[n_next:]
+        self._blob = ints[end + 16 * n_next :]
+
+        sizes = [
+            n_strings + 1,
+            n_protocols * _PROTOCOL_FIELDS,
+            n_states * _STATE_FIELDS,
+            n_wrong,
+            n_next * _NEXT_FIELDS,
+            n_next,
+        ]
+        sections = []
+        start = 0
+        for size in sizes:
+            sections.append(arrays[start : start + size])
+            start += size
+        (
+            self._offsets,
+            protocols,
+            self._states,
+            self._wrong,
+            self._next,
+            self._aliases,
+        ) = sections
+
+        # Only protocol names are decoded up front
+        self._protocols: dict[str, SharedProtocol] = {}
+        for i in range(n_protocols):
+            row = i * _PROTOCOL_FIELDS
+            name_index, first, count, fingerprint = protocols[
+                row : row + _PROTOCOL_FIELDS
+            ]
+            name = self._string(name_index)
+            self._protocols[name] = SharedProtocol(
+                self,
+                name,
+                first,
+                count,
+                None if fingerprint < 0 else self._string(fingerprint),
+            )
+
+    @classmethod
+    def create(
+        cls, protocols: dict[str, Protocol], name: str | None = None
+    ) -> "SharedLibrary":
+        """Serialize a library into a new shared memory block."""
+        data = serialize_library(protocols)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        shm.buf[: len(data)] = data
+        return cls(shm, owner=True)
+
+    @classmethod
+    def from_directory(
+        cls, directory: Path, name: str | None = None
+    ) -> "SharedLibrary":
+        """Load a protocol directory straight into shared memory."""
+        return cls.create(load_protocols_from_directory(directory), name)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedLibrary":
+        """Attach to a library created by another process."""
+        return cls(shared_memory.SharedMemory(name=name, track=False), owner=False)
+
+    @property
+    def name(self) -> str:
+        """Name other processes attach with."""
+        return self.shm.name
+
+    def __enter__(self) -> "SharedLibrary":
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def close(self):
+        """Release this process's views of the block."""
+        self._protocols.clear()
+        self._state_cache.clear()
+        for view in (
+            self._offsets,
+            self._states,
+            self._wrong,
+            self._next,
+            self._aliases,
+            self._weights,
+            self._accept,
+            self._blob,
+        ):
+            view.release()
+        self.shm.close()
+
+    def unlink(self):
+        """Free the block; call once, from the creating process."""
+        self.shm.unlink()
+
+    def _string(self, index: int) -> str:
+        return str(self._blob[self._offsets[index] : self._offsets[index + 1]], "utf-8")
+
+    def _state(self, index: int) -> State:
+        """The State object for a row of the states table, from the cache."""
+        state = self._state_cache.get(index)
+        if state is not None:
+            self._state_cache.move_to_end(index)
+            return state
+        state = self._state_cache[index] = self._build_state(index)
+        if len(self._state_cache) > self._cache_size:
+            self._state_cache.popitem(last=False)
+        return state
+
+    def _build_state(self, index: int) -> State:
+        """Build the State object for a row of the states table."""
+        row = index * _STATE_FIELDS
+        (
+            state_id,
+            state_type,
+            description,
+            correct,
+            wrong_start,
+            wrong_count,
+            next_start,
+            next_count,
+        ) = self._states[row : row + _STATE_FIELDS]
+
+        next_state_ids: list[int | str] = []
+        for i in range(next_start, next_start + next_count):
+            kind, value = self._next[i * 2 : i * 2 + 2]
+            next_state_ids.append(self._string(value) if kind else value)
+        end = next_start + next_count
+        weights = self._weights[next_start:end].tolist()
+        table = None
+        if weights and not math.isnan(weights[0]):
+            table = AliasTable.from_tables(
+                weights,
+                self._accept[next_start:end].tolist(),
+                self._aliases[next_start:end].tolist(),
+            )
+
+        return State(
+            id=state_id,
+            description=self._string(description),
+            state_type=StateType(state_type),
+            correct_answer=None if correct < 0 else self._string(correct),
+            wrong_answers=[
+                self._string(i)
+                for i in self._wrong[wrong_start : wrong_start + wrong_count]
+            ],
+            next_state_ids=next_state_ids,
+            next_state_weights=weights if table is not None else None,
+            transition_table=table,
+        )
+
+    def __getitem__(self, name: str) -> SharedProtocol:
+        return self._protocols[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._protocols)
+
+    def __len__(self) -> int:
+        return len(self._protocols)
@@ -0,0 +1,182 @@
+"""Synthetic protocol corpus generator for scaling tests.
+
+Generates valid protocol markdown in the format documented by
+parse_protocol_file, with tunable corpus size and graph shape.
+
+Run with python -m protocols.synth OUTPUT_DIR.
+"""
+
+import argparse
+import random
+from pathlib import Path
+
+_WORDS = (
+    "administer airway assess apply begin breathing check chest compressions "
+    "continue defibrillate deliver delay establish evaluate give immobilize "
+    "insert monitor obtain open oxygen patient perform place position pulse "
+    "reassess recovery request rescue secure start suction support transport "
+    "ventilate vitals access backup cannula collar dose epinephrine glucose "
+    "history hospital line mask nasal oral pressure pupils rhythm scene spine"
+).split()
+
+
+def protocol_name(index: int) -> str:
+    """Name of the index-th synthetic protocol."""
+    return f"Synthetic Protocol {index:05d}"
+
+
+def _sentence(rng: random.Random, min_words: int = 4, max_words: int = 9) -> str:
+    """Build a random sentence that can't be mistaken for a state header."""
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def generate_protocol(
+    name: str,
+    states: int = 50,
+    branching: int = 2,
+    wrong_answers: int = 15,
+    links: list[str] | None = None,
+    rng: random.Random | None = None,
+    weighted: bool = False,
+) -> str:
+    """Generate the markdown for one protocol.
+
+    State 0 is an INTRO state, the last state is FINAL and every other state
+    is a QUESTION state. Transitions only go forward, and each state links to
+    the next one, so every state is reachable. Within one protocol every
+    session terminates; cross-protocol links may form cycles (A -> B -> A)
+    across a corpus, and sessions following them can repeat indefinitely.
+
+    Args:
+        name: Protocol name written in the header
+        states: Total number of states (at least 2)
+        branching: Maximum number of next states per state
+        wrong_answers: Size of each question's wrong answer pool
+        links: Protocol names to jump to; each is added as a transition of a
+            randomly chosen question state
+        rng: Random generator (a fresh one if None)
+        weighted: Give every transition a random weight from 1 to 9
+
+    Returns:
+        The protocol file contents
+    """
+    if states < 2:
+        raise ValueError(f"states must be at least 2 (INTRO and FINAL), got {states}")
+    if branching < 1:
+        raise ValueError(f"branching must be at least 1, got {branching}")
+
+    rng = rng or random.Random()
+    final_id = states - 1
+
+    next_ids: dict[int, list[int | str]] = {}
+    for state_id in range(final_id):
+        later = range(state_id + 2, states)
+        extra = rng.sample(later, min(branching - 1, len(later)))
+        next_ids[state_id] = [state_id + 1] + sorted(extra)
+
+    question_ids = list(range(1, final_id))
+    for link in links or []:
+        if not question_ids:
+            break
+        state_id = rng.choice(question_ids)
+        next_ids[state_id].append(link)
+
+    lines = [name, "=" * max(len(name), 32)]
+    for state_id in range(states):
+        lines.append(f"{state_id}: {_sentence(rng)}")
+        if 0 < state_id < final_id:
+            lines.append("# Correct answer:")
+            lines.append(_sentence(rng))
+            lines.append("# Wrong answers:")
+            lines.extend(_sentence(rng) for _ in range(wrong_answers))
+        if state_id in next_ids:
+            lines.append("# Next state:")
+            for next_id in next_ids[state_id]:
+                weight = f" [{rng.randint(1, 9)}]" if weighted else ""
+                lines.append(f"{next_id}{weight}")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def write_corpus(
+    directory: Path,
+    files: int = 10,
+    states: int = 50,
+    branching: int = 2,
+    wrong_answers: int = 15,
+    cross_links: int = 0,
+    seed: int | None = None,
+    weighted: bool = False,
+) -> list[Path]:
+    """Write a corpus of synthetic protocol files.
+
+    Args:
+        directory: Output directory, created if missing
+        files: Number of protocol files
+        states: States per protocol
+        branching: Maximum number of next states per state
+        wrong_answers: Size of each question's wrong answer pool
+        cross_links: Number of cross-protocol transitions per protocol; these
+            may form cycles between protocols
+        seed: Seed for reproducible corpora
+        weighted: Give every transition a random weight
+
+    Returns:
+        Paths of the written files
+    """
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for index in range(files):
+        others = rng.sample(range(files), min(files, cross_links + 1))
+        links = [protocol_name(i) for i in others if i != index][:cross_links]
+        text = generate_protocol(
+            protocol_name(index),
+            states=states,
+            branching=branching,
+            wrong_answers=wrong_answers,
+            links=links,
+            rng=rng,
+            weighted=weighted,
+        )
+        path = directory / f"synthetic_{index:05d}.md"
+        path.write_text(text)
+        paths.append(path)
+
+    return paths
+
+
+def main():
+    """Generate a synthetic corpus from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--states", type=int, default=50)
+    parser.add_argument("--branching", type=int, default=2)
+    parser.add_argument("--wrong-answers", type=int, default=15)
+    parser.add_argument("--cross-links", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--weighted", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        paths = write_corpus(
+            args.output,
+            files=args.files,
+            states=args.states,
+            branching=args.branching,
+            wrong_answers=args.wrong_answers,
+            cross_links=args.cross_links,
+            seed=args.seed,
+            weighted=args.weighted,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Wrote {len(paths)} protocols to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
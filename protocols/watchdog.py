@@ -0,0 +1,176 @@
+"""Watchdog that reports stalls of the Tk main loop."""
+
+import logging
+import sys
+import threading
+import time
+import tkinter as tk
+import traceback
+from dataclasses import dataclass, field
+from types import FrameType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StallStats:
+    """Running counters of event loop stalls."""
+
+    stalls: int = 0
+    total_seconds: float = 0.0
+    longest_seconds: float = 0.0
+    last_callback: str | None = None
+    by_callback: dict[str, int] = field(default_factory=dict)
+
+
+class StallWatchdog:
+    """Detect when callbacks block root.mainloop() for too long.
+
+    A heartbeat is scheduled on the Tk event loop with root.after. A
+    background thread checks that the heartbeat keeps firing; when it stops
+    for longer than the threshold, the main thread's stack is captured and
+    logged along with the Tk callback that is running. The stall's full
+    duration is recorded once the heartbeat resumes.
+    """
+
+    def __init__(
+        self,
+        root: tk.Tk,
+        threshold: float = 0.5,
+        interval: float = 0.1,
+    ):
+        """Initialize the watchdog.
+
+        Args:
+            root: The tkinter root window whose event loop is watched
+            threshold: Seconds the loop may be blocked before it's a stall
+            interval: Seconds between heartbeats
+        """
+        self.root = root
+        self.threshold = threshold
+        self.interval = interval
+
+        self._main_thread_id = threading.main_thread().ident
+        self._lock = threading.Lock()
+        self._stats = StallStats()
+        self._last_beat = time.monotonic()
+        self._stall_callback: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._after_id: str | None = None
+
+    def start(self):
+        """Start the heartbeat and the watchdog thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._last_beat = time.monotonic()
+        self._after_id = self.root.after(int(self.interval * 1000), self._beat)
+        self._thread = threading.Thread(
+            target=self._watch, name="stall-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the heartbeat and the watchdog thread."""
+        self._stop.set()
+        if self._after_id is not None:
+            # Usually called after mainloop returns, when the root may already
+            # be destroyed; its pending heartbeat went with it then
+            try:
+                if self.root.winfo_exists():
+                    self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> StallStats:
+        """Get a snapshot of the stall counters."""
+        with self._lock:
+            return StallStats(
+                stalls=self._stats.stalls,
+                total_seconds=self._stats.total_seconds,
+                longest_seconds=self._stats.longest_seconds,
+                last_callback=self._stats.last_callback,
+                by_callback=dict(self._stats.by_callback),
+            )
+
+    def _beat(self):
+        """Heartbeat run on the Tk event loop."""
+        now = time.monotonic()
+        stalled = now - self._last_beat - self.interval
+
+        with self._lock:
+            self._last_beat = now
+            callback = self._stall_callback
+            self._stall_callback = None
+            if stalled > self.threshold:
+                callback = callback or "<unknown>"
+                self._stats.stalls += 1
+                self._stats.total_seconds += stalled
+                self._stats.longest_seconds = max(
+                    self._stats.longest_seconds, stalled
+                )
+                self._stats.last_callback = callback
+                self._stats.by_callback[callback] = (
+                    self._stats.by_callback.get(callback, 0) + 1
+                )
+
+        if stalled > self.threshold:
+            logger.warning("UI event loop stalled for %.3fs in %s", stalled, callback)
+
+        if not self._stop.is_set():
+            self._after_id = self.root.after(int(self.interval * 1000), self._beat)
+
+    def _watch(self):
+        """Watchdog thread: capture the main thread's stack during a stall."""
+        while not self._stop.wait(self.interval / 2):
+            with self._lock:
+                last_beat = self._last_beat
+                reported = self._stall_callback is not None
+            stalled = time.monotonic() - last_beat - self.interval
+            if stalled <= self.threshold or reported:
+                continue
+
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+            callback = _find_callback(frame)
+            with self._lock:
+                if self._last_beat != last_beat:
+                    continue  # The loop recovered meanwhile
+                self._stall_callback = callback
+            logger.warning(
+                "UI event loop blocked for %.3fs in %s:\n%s",
+                stalled,
+                callback,
+                "".join(traceback.format_stack(frame)),
+            )
+
+
+def _find_callback(frame: FrameType) -> str:
+    """Name the Tk callback a main thread frame is running inside."""
+    frames: list[FrameType] = []
+    current: FrameType | None = frame
+    while current is not None:
+        frames.append(current)
+        current = current.f_back
+    frames.reverse()
+
+    # The callback is the first non-tkinter frame below tkinter's dispatcher
+    in_dispatch = False
+    for candidate in frames:
+        is_tkinter = candidate.f_globals.get("__name__") == "tkinter"
+        if is_tkinter and candidate.f_code.co_name == "__call__":
+            in_dispatch = True
+        elif in_dispatch and not is_tkinter:
+            return _describe(candidate)
+    return f"<outside callback: {_describe(frame)}>"
+
+
+def _describe(frame: FrameType) -> str:
+    """Describe a frame as module.function."""
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_qualname}"
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import pytest
+
+from protocols.synth import write_corpus
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    """A weighted synthetic corpus with cross-protocol links."""
+    directory = tmp_path / "corpus"
+    write_corpus(
+        directory,
+        files=6,
+        states=12,
+        branching=3,
+        wrong_answers=6,
+        cross_links=2,
+        seed=7,
+        weighted=True,
+    )
+    return directory
+
@@ -0,0 +1,58 @@
+import random
+from collections import Counter
+
+import pytest
+
+from protocols.models import AliasTable
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [[1.0], [1.0, 1.0], [3.0, 1.0], [0.1, 5.0, 2.5, 2.4], [9, 1, 1, 1, 1, 1, 1]],
+)
+def test_samples_follow_the_weights(weights: list[float]):
+    table = AliasTable(weights)
+    draws = 200_000
+    counts = Counter(table.sample_many(draws, random.Random(1)))
+    total = sum(weights)
+    for outcome, weight in enumerate(weights):
+        expected = weight / total
+        # Far beyond sampling noise at this many draws
+        assert counts[outcome] / draws == pytest.approx(expected, abs=0.005)
+
+
+def test_probabilities_are_normalized():
+    assert AliasTable([3, 1]).probabilities() == [0.75, 0.25]
+
+
+def test_columns_account_for_every_outcome():
+    weights = [0.1, 5.0, 2.5, 2.4]
+    probabilities, aliases = AliasTable(weights).tables()
+    n = len(weights)
+    mass = [0.0] * n
+    for column, (accept, alias) in enumerate(zip(probabilities, aliases)):
+        mass[column] += accept / n
+        mass[alias] += (1 - accept) / n
+    assert mass == pytest.approx([w / sum(weights) for w in weights])
+
+
+def test_sample_and_sample_many_agree():
+    table = AliasTable([0.1, 5.0, 2.5, 2.4])
+    rng = random.Random(3)
+    single = [table.sample(rng) for _ in range(1000)]
+    assert table.sample_many(1000, random.Random(3)) == single
+
+
+def test_from_tables_rebuilds_the_same_table():
+    table = AliasTable([0.1, 5.0, 2.5, 2.4])
+    rebuilt = AliasTable.from_tables(table.weights, *table.tables())
+    assert rebuilt.tables() == table.tables()
+    assert rebuilt.sample_many(100, random.Random(5)) == table.sample_many(
+        100, random.Random(5)
+    )
+
+
+@pytest.mark.parametrize("weights", [[], [1.0, 0.0], [1.0, -2.0], [float("inf")]])
+def test_invalid_weights_are_rejected(weights: list[float]):
+    with pytest.raises(ValueError):
+        AliasTable(weights)
@@ -0,0 +1,200 @@
+from pathlib import Path
+
+import pytest
+
+from protocols.parser import (
+    load_protocols_from_directory,
+    parse_pool_library,
+    parse_protocol_file,
+)
+
+LIBRARY = """\
+## Pool: airway
+Tilt the head back.
+Give oxygen.
+Check the pulse.
+
+## Pool: transport
+Call for transport.
+Check the pulse.
+"""
+
+PROTOCOL = """\
+Pools Protocol
+================================
+# Include: shared.pools.md
+## Pool: local
+Wait and see.
+Check the pulse.
+
+0: Start
+# Next state:
+1 [3]
+2
+
+1: Question one
+# Correct answer:
+Give oxygen.
+# Wrong answers:
+@airway
+# Next state:
+3
+
+2: Question two
+# Correct answer:
+Open the airway.
+# Wrong answers:
+Give oxygen.
+@airway
+@transport
+# Next state:
+3 [0.5]
+CPR [adult]
+
+3: Question three
+# Correct answer:
+Open the airway.
+# Wrong answers:
+@local
+# Next state:
+4
+
+4: End
+"""
+
+
+@pytest.fixture
+def library_dir(tmp_path: Path) -> Path:
+    (tmp_path / "shared.pools.md").write_text(LIBRARY)
+    (tmp_path / "pools.md").write_text(PROTOCOL)
+    return tmp_path
+
+
+def protocol_file(tmp_path: Path, states: str, name: str = "P") -> Path:
+    path = tmp_path / f"{name.lower()}.md"
+    path.write_text(f"{name}\n=====\n{states}")
+    return path
+
+
+def test_pool_library_is_parsed_into_tuples(library_dir: Path):
+    pools = parse_pool_library(library_dir / "shared.pools.md")
+    assert pools == {
+        "airway": ("Tilt the head back.", "Give oxygen.", "Check the pulse."),
+        "transport": ("Call for transport.", "Check the pulse."),
+    }
+
+
+def test_pool_reference_excludes_the_correct_answer(library_dir: Path):
+    protocol = parse_protocol_file(library_dir / "pools.md")
+    assert protocol.states[1].wrong_answers == (
+        "Tilt the head back.",
+        "Check the pulse.",
+    )
+
+
+def test_inline_answers_come_first_and_duplicates_are_dropped(library_dir: Path):
+    protocol = parse_protocol_file(library_dir / "pools.md")
+    assert protocol.states[2].wrong_answers == (
+        "Give oxygen.",
+        "Tilt the head back.",
+        "Check the pulse.",
+        "Call for transport.",
+    )
+
+
+def test_pools_declared_in_the_protocol_file(library_dir: Path):
+    protocol = parse_protocol_file(library_dir / "pools.md")
+    assert protocol.states[3].wrong_answers == ("Wait and see.", "Check the pulse.")
+
+
+def test_states_using_the_same_pool_share_one_tuple(tmp_path: Path):
+    (tmp_path / "shared.pools.md").write_text(LIBRARY)
+    states = """\
+# Include: shared.pools.md
+0: One
+# Correct answer:
+Open the airway.
+# Wrong answers:
+@airway
+# Next state:
+1
+
+1: Two
+# Correct answer:
+Open the airway.
+# Wrong answers:
+@airway
+# Next state:
+2
+
+2: End
+"""
+    pool_cache = {}
+    first = parse_protocol_file(protocol_file(tmp_path, states, "A"), pool_cache)
+    second = parse_protocol_file(protocol_file(tmp_path, states, "B"), pool_cache)
+    shared = first.states[0].wrong_answers
+    assert isinstance(shared, tuple)
+    assert first.states[1].wrong_answers is shared
+    assert second.states[0].wrong_answers is shared
+
+
+def test_transition_weights(library_dir: Path):
+    protocol = parse_protocol_file(library_dir / "pools.md")
+    start = protocol.states[0]
+    assert start.next_state_ids == (1, 2)
+    assert start.next_state_weights == (3.0, 1.0)
+    assert start.transition_probabilities() == [(1, 0.75), (2, 0.25)]
+
+
+def test_non_numeric_brackets_are_part_of_the_name(library_dir: Path):
+    protocol = parse_protocol_file(library_dir / "pools.md")
+    state = protocol.states[2]
+    assert state.next_state_ids == (3, "CPR [adult]")
+    assert state.next_state_weights == (0.5, 1.0)
+
+
+def test_unweighted_states_have_no_table(library_dir: Path):
+    protocol = parse_protocol_file(library_dir / "pools.md")
+    assert protocol.states[1].next_state_weights is None
+    assert protocol.states[1].transition_table is None
+
+
+def test_zero_weight_is_rejected(tmp_path: Path):
+    path = protocol_file(tmp_path, "0: Start\n# Next state:\n1 [0]\n\n1: End\n")
+    with pytest.raises(ValueError, match="invalid transition weight"):
+        parse_protocol_file(path)
+
+
+def test_unknown_pool_is_rejected(tmp_path: Path):
+    states = (
+        "0: Q\n# Correct answer:\nA\n# Wrong answers:\n@missing\n"
+        "# Next state:\n1\n\n1: End\n"
+    )
+    with pytest.raises(ValueError, match="unknown answer pool 'missing'"):
+        parse_protocol_file(protocol_file(tmp_path, states))
+
+
+def test_circular_include_is_rejected(tmp_path: Path):
+    (tmp_path / "a.pools.md").write_text("# Include: b.pools.md\n## Pool: a\nA\n")
+    (tmp_path / "b.pools.md").write_text("# Include: a.pools.md\n## Pool: b\nB\n")
+    with pytest.raises(ValueError, match="Circular include"):
+        parse_pool_library(tmp_path / "a.pools.md")
+
+
+def test_missing_include_is_rejected(tmp_path: Path):
+    path = protocol_file(tmp_path, "# Include: nowhere.pools.md\n0: End\n")
+    with pytest.raises(FileNotFoundError):
+        parse_protocol_file(path)
+
+
+def test_pool_libraries_are_not_loaded_as_protocols(library_dir: Path):
+    assert list(load_protocols_from_directory(library_dir)) == ["Pools Protocol"]
+
+
+def test_fingerprint_follows_included_libraries(library_dir: Path):
+    before = parse_protocol_file(library_dir / "pools.md").fingerprint
+    assert parse_protocol_file(library_dir / "pools.md").fingerprint == before
+
+    library = library_dir / "shared.pools.md"
+    library.write_text(library.read_text() + "\n## Pool: extra\nMore.\n")
+    assert parse_protocol_file(library_dir / "pools.md").fingerprint != before
@@ -0,0 +1,86 @@
+import random
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from protocols.gameplay import GameplayController, play_session
+from protocols.parser import load_protocols_from_directory
+from protocols.replay import SessionRecord, replay_session, replay_sessions
+
+
+@pytest.fixture
+def records(corpus: Path) -> list[SessionRecord]:
+    """Sessions played with random answers, as the app records them."""
+    protocols = load_protocols_from_directory(corpus)
+    controller = GameplayController(protocols)
+    rng = random.Random(11)
+    names = sorted(protocols)
+    played = []
+    for seed in range(60):
+        play_session(
+            controller,
+            rng.choice(names),
+            lambda prepared: rng.choice(prepared.options),
+            seed=seed,
+        )
+        played.append(SessionRecord.from_controller(controller))
+    return played
+
+
+def test_json_round_trip(records: list[SessionRecord]):
+    for record in records:
+        assert SessionRecord.from_json(record.to_json()) == record
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"processes": 1},
+        {"processes": 3},
+        {"processes": 3, "share_library": True},
+    ],
+    ids=["in-process", "workers", "shared-library"],
+)
+def test_replay_reproduces_every_session(
+    corpus: Path, records: list[SessionRecord], options: dict
+):
+    results = replay_sessions(records, corpus, chunksize=8, **options)
+    assert [result.divergence for result in results] == [None] * len(records)
+    assert [result.states for result in results] == [r.states for r in records]
+    assert [(r.correct, r.total) for r in results] == [
+        (r.correct, r.total) for r in records
+    ]
+
+
+def test_changed_answers_diverge(corpus: Path, records: list[SessionRecord]):
+    protocols = load_protocols_from_directory(corpus)
+    record = next(r for r in records if r.answers)
+    tampered = replace(record, answers=["Not an option"] + record.answers[1:])
+    result = replay_session(protocols, tampered)
+    assert result.diverged
+    assert "not offered" in result.divergence
+
+
+def test_changed_seed_diverges(corpus: Path, records: list[SessionRecord]):
+    protocols = load_protocols_from_directory(corpus)
+    diverged = [
+        replay_session(protocols, replace(r, seed=r.seed + 1000)).diverged
+        for r in records
+    ]
+    assert any(diverged)
+
+
+def test_only_sessions_through_a_changed_protocol_are_skipped(
+    corpus: Path, records: list[SessionRecord]
+):
+    edited = "Synthetic Protocol 00000"
+    path = corpus / "synthetic_00000.md"
+    path.write_text(path.read_text() + "\n")
+
+    results = replay_sessions(records, corpus, processes=1)
+    for record, result in zip(records, results):
+        visited = {name for name, _ in record.states}
+        assert result.library_changed == (edited in visited)
+        assert not result.diverged
+    assert any(result.library_changed for result in results)
@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from protocols.parser import load_protocols_from_directory
+from protocols.shared import SharedLibrary
+
+
+def test_attached_library_matches_the_loaded_one(corpus: Path):
+    (corpus / "shared.pools.md").write_text("## Pool: common\nOne.\nTwo.\n")
+    (corpus / "pooled.md").write_text(
+        "Pooled\n=====\n# Include: shared.pools.md\n"
+        "0: Question\n# Correct answer:\nThree.\n# Wrong answers:\n@common\n"
+        "# Next state:\n1 [2]\nSynthetic Protocol 00000\n\n1: End\n"
+    )
+    protocols = load_protocols_from_directory(corpus)
+
+    with SharedLibrary.create(protocols) as created:
+        attached = SharedLibrary.attach(created.name)
+        try:
+            assert sorted(attached) == sorted(protocols)
+            for name, protocol in protocols.items():
+                shared = attached[name]
+                assert shared.fingerprint == protocol.fingerprint
+                assert sorted(shared.states) == sorted(protocol.states)
+                for state_id, state in protocol.states.items():
+                    assert shared.get_state(state_id) == state
+                    assert (
+                        shared.get_state(state_id).transition_probabilities()
+                        == state.transition_probabilities()
+                    )
+                assert shared.get_state(max(protocol.states) + 1) is None
+        finally:
+            attached.close()
+
+
+def test_shared_pools_stay_shared(corpus: Path):
+    protocols = load_protocols_from_directory(corpus)
+    with SharedLibrary.create(protocols) as library:
+        state = next(iter(library.values())).get_state(1)
+        assert library[next(iter(library))].get_state(1) is state